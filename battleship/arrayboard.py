@@ -0,0 +1,120 @@
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .core import Board, MISS, SUNK
+
+CELL_WATER = 0
+CELL_SHIP = 1
+CELL_MISS = 2
+CELL_HIT = 3
+CELL_HALO = 4
+
+GLYPHS = ("O", "■", ".", "X", ".")
+# Fog of war is a code table: hidden ships render as water.
+FOG_CODES = (CELL_WATER, CELL_WATER, CELL_MISS, CELL_HIT, CELL_HALO)
+
+
+@lru_cache(maxsize=None)
+def _layout(size):
+    width = len(str(size))
+    header = " " * width + " | " + " | ".join(str(i + 1).rjust(width) for i in range(size)) + " |"
+    prefixes = [f"{str(i + 1).rjust(width)} | " for i in range(size)]
+    cells = [" " * (width - 1) + glyph for glyph in GLYPHS]
+    return width, header, prefixes, cells
+
+
+@lru_cache(maxsize=None)
+def _np_layout(size):
+    width, header, prefixes, _ = _layout(size)
+    blank = " | ".join([" " * width] * size) + " |"
+    rows = [prefix + blank for prefix in prefixes]
+    line = len(rows[0])
+    base = np.array([[ord(c) for c in row] for row in rows], dtype=np.uint32)
+    step = width + 3
+    cols = step + np.arange(size) * step + (width - 1)
+    points = np.array([ord(glyph) for glyph in GLYPHS], dtype=np.uint32)
+    return header, base, cols, points, line
+
+
+class ArrayBoard(Board):
+    # Board that mirrors its field as one byte code per cell; rendering and
+    # masks work on the codes (vectorized when NumPy is available).
+    def __init__(self, hid=False, size=6, use_numpy=True):
+        super().__init__(hid=hid, size=size)
+        self.numpy = use_numpy and np is not None
+        if self.numpy:
+            self.codes = np.zeros((size, size), dtype=np.uint8)
+        else:
+            self.codes = [bytearray(size) for _ in range(size)]
+
+    def add_ship(self, ship):
+        super().add_ship(ship)
+        for d in ship.dots:
+            self.codes[d.x][d.y] = CELL_SHIP
+
+    def fire(self, d):
+        result = super().fire(d)
+        self.codes[d.x][d.y] = CELL_MISS if result.code == MISS else CELL_HIT
+        if result.code == SUNK:
+            for h in result.halo:
+                self.codes[h.x][h.y] = CELL_HALO
+        return result
+
+    def restore(self, data):
+        super().restore(data)
+        size = self.size
+        glyph_codes = {"O": CELL_WATER, "■": CELL_SHIP, ".": CELL_MISS, "X": CELL_HIT}
+        rows = [bytearray(glyph_codes[c] for c in row) for row in self.field]
+        # Halo cells share the miss glyph; the snapshot's halo bit tells them apart.
+        for d in self.halo:
+            rows[d.x][d.y] = CELL_HALO
+        if self.numpy:
+            self.codes = np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(size, size).copy()
+        else:
+            self.codes = rows
+        return self
+
+    def mask(self, code):
+        if self.numpy:
+            return self.codes == code
+        return [[c == code for c in row] for row in self.codes]
+
+    @property
+    def hit_mask(self):
+        return self.mask(CELL_HIT)
+
+    @property
+    def miss_mask(self):
+        return self.mask(CELL_MISS)
+
+    @property
+    def halo_mask(self):
+        return self.mask(CELL_HALO)
+
+    def __str__(self):
+        if self.numpy:
+            return self._render_numpy()
+        return self._render_python()
+
+    def _render_numpy(self):
+        header, base, cols, points, line = _np_layout(self.size)
+        codes = self.codes
+        if self.hid:
+            codes = np.asarray(FOG_CODES, dtype=np.uint8)[codes]
+        buf = base.copy()
+        buf[:, cols] = points[codes]
+        rows = buf.view(f"<U{line}").ravel().tolist()
+        return header + "\n" + "\n".join(rows)
+
+    def _render_python(self):
+        _, header, prefixes, cells = _layout(self.size)
+        if self.hid:
+            cells = [cells[code] for code in FOG_CODES]
+        lines = [header]
+        for prefix, row in zip(prefixes, self.codes):
+            lines.append(prefix + " | ".join([cells[c] for c in row]) + " |")
+        return "\n".join(lines)
@@ -0,0 +1,311 @@
+from itertools import compress
+
+from .core import (
+    _CELL_HALO,
+    _CELL_OCCUPIED,
+    _CELL_SHOT,
+    _FLAG_HID,
+    _FLAG_STARTED,
+    _HALO_PLANE,
+    _OCCUPIED_PLANE,
+    _SHOT_PLANE,
+    _SNAPSHOT_HEADER,
+    _field_cells,
+    _pack_snapshot,
+    _unpack_snapshot,
+    CellPool,
+    Dot,
+    MISS,
+    HIT,
+    SUNK,
+    SHOT_MESSAGES,
+    Ship,
+    ShotResult,
+    BoardOutException,
+    BoardUsedException,
+    BoardWrongShipException,
+)
+
+
+def iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# Per-cell 0/1 flags as the digits of a base-2 literal.
+_FLAG_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _plane_mask(cells, plane):
+    mask = 0
+    for i in compress(range(len(cells)), cells.translate(plane)):
+        mask |= 1 << i
+    return mask
+
+
+class MaskView:
+    # Read-only view that makes a bitmask look like Board's cell sets.
+    def __init__(self, board, mask):
+        self.board = board
+        self.mask = mask
+
+    def __contains__(self, d):
+        if self.board.out(d):
+            return False
+        return bool(self.mask & self.board.bit(d))
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def __iter__(self):
+        return (self.board.dot(i) for i in iter_bits(self.mask))
+
+
+class CellView:
+    # Read-only view over one flag byte per cell, for state a shot changes:
+    # setting a byte is O(1) where or-ing a bit into a big int copies it.
+    def __init__(self, board, cells):
+        self.board = board
+        self.cells = cells
+
+    def __contains__(self, d):
+        if self.board.out(d):
+            return False
+        return bool(self.cells[d.x * self.board.size + d.y])
+
+    def __len__(self):
+        return self.cells.count(1)
+
+    def __iter__(self):
+        return (self.board.dot(i) for i in compress(range(len(self.cells)), self.cells))
+
+
+class BitBoard:
+    def __init__(self, hid=False, size=6):
+        self.size = size
+        self.hid = hid
+
+        self.count = 0
+
+        self.field = [["O"] * size for _ in range(size)]
+        self.grid = Dot.grid(size)
+        self.ships = []
+
+        self.full_mask = (1 << (size * size)) - 1
+        first_col = 0
+        for x in range(size):
+            first_col |= 1 << (x * size)
+        last_col = first_col << (size - 1)
+        self._not_first_col = self.full_mask & ~first_col
+        self._not_last_col = self.full_mask & ~last_col
+
+        # occupied_mask mirrors Board.occupied (ships and halo during setup),
+        # closed_mask mirrors Board.shots (fired cells and revealed contours).
+        # On a large board every |= copies the whole int, so a shot only
+        # flags its cell in _closed; closed_mask is rebuilt when read, and
+        # shot_mask and hit_mask are derived from it.
+        self.occupied_mask = 0
+        self.closed_mask = 0
+        self.ship_mask = 0
+        self.halo_mask = 0
+        self.started = False
+        self._owner = {}
+        self._unshot = None
+
+    def bit(self, d):
+        return 1 << (d.x * self.size + d.y)
+
+    def dot(self, index):
+        x, y = divmod(index, self.size)
+        return self.grid[x][y]
+
+    def mask_of(self, dots):
+        mask = 0
+        for d in dots:
+            mask |= self.bit(d)
+        return mask
+
+    def dots_of(self, mask):
+        return [self.dot(i) for i in iter_bits(mask)]
+
+    def spread(self, mask):
+        # 8-neighborhood dilation; column masks stop row wrap-around.
+        row = mask | ((mask << 1) & self._not_first_col) | ((mask >> 1) & self._not_last_col)
+        return (row | (row << self.size) | (row >> self.size)) & self.full_mask
+
+    @property
+    def closed_mask(self):
+        if self._closed_stale:
+            self._closed_mask = int(self._closed[::-1].translate(_FLAG_DIGITS), 2)
+            self._closed_stale = False
+        return self._closed_mask
+
+    @closed_mask.setter
+    def closed_mask(self, mask):
+        self._closed_mask = mask
+        self._closed = bytearray(self.size * self.size)
+        for i in iter_bits(mask):
+            self._closed[i] = 1
+        self._closed_stale = False
+
+    @property
+    def shot_mask(self):
+        return self.closed_mask & ~self.halo_mask
+
+    @property
+    def hit_mask(self):
+        return self.closed_mask & self.ship_mask
+
+    @property
+    def occupied(self):
+        return MaskView(self, self.occupied_mask)
+
+    @property
+    def shots(self):
+        return CellView(self, self._closed)
+
+    @property
+    def busy(self):
+        return self.shots if self.started else self.occupied
+
+    @property
+    def unshot(self):
+        if self._unshot is None:
+            closed = self._closed
+            size = self.size
+            self._unshot = CellPool(d for row in self.grid for d in row if not closed[d.x * size + d.y])
+        return self._unshot
+
+    def add_ship(self, ship):
+        dots = ship.dots
+        for d in dots:
+            if self.out(d):
+                raise BoardWrongShipException()
+        mask = self.mask_of(dots)
+        if mask & self.occupied_mask:
+            raise BoardWrongShipException()
+        for d in dots:
+            self.field[d.x][d.y] = "■"
+        for i in iter_bits(mask):
+            self._owner[i] = ship
+
+        self.ship_mask |= mask
+        self.occupied_mask |= mask
+        self.ships.append(ship)
+        self.contour(ship)
+
+    def contour(self, ship, verb=False):
+        dots = [d for d in ship.dots if not self.out(d)]
+        spread = self.spread(self.mask_of(dots))
+        if not verb:
+            new = spread & ~self.occupied_mask
+            self.occupied_mask |= new
+            return self.dots_of(new)
+
+        new = spread & ~self.closed_mask
+        self._closed_mask |= new
+        self.halo_mask |= new
+        added = []
+        for i in iter_bits(new):
+            d = self.dot(i)
+            self._closed[i] = 1
+            self.field[d.x][d.y] = "."
+            self.unshot.discard(d)
+            added.append(d)
+        return added
+
+    def __str__(self):
+        res = ""
+        width = len(str(self.size))
+        header_cells = [str(i + 1).rjust(width) for i in range(self.size)]
+        res += " " * width + " | " + " | ".join(header_cells) + " |"
+        for i, row in enumerate(self.field):
+            row_num = str(i + 1).rjust(width)
+            row_cells = [cell.rjust(width) for cell in row]
+            res += f"\n{row_num} | " + " | ".join(row_cells) + " |"
+
+        if self.hid:
+            res = res.replace("■", "O")
+        return res
+
+    def out(self, d):
+        return not((0 <= d.x < self.size) and (0 <= d.y < self.size))
+
+    def fire(self, d):
+        if self.out(d):
+            raise BoardOutException()
+
+        index = d.x * self.size + d.y
+        if self._closed[index]:
+            raise BoardUsedException()
+
+        self._closed[index] = 1
+        self._closed_stale = True
+        self.unshot.discard(d)
+
+        ship = self._owner.get(index)
+        if ship is not None:
+            ship.lives -= 1
+            self.field[d.x][d.y] = "X"
+            if ship.lives == 0:
+                self.count += 1
+                return ShotResult(SUNK, d, ship, self.contour(ship, verb=True))
+            return ShotResult(HIT, d, ship)
+
+        self.field[d.x][d.y] = "."
+        return ShotResult(MISS, d)
+
+    def shot(self, d):
+        result = self.fire(d)
+        return result.repeat, SHOT_MESSAGES[result.code]
+
+    def begin(self):
+        self.closed_mask = 0
+        self.halo_mask = 0
+        self._unshot = None
+        self.started = True
+
+    # Same snapshot format as Board, so either class can read the other's.
+    def snapshot(self):
+        cells = _field_cells(self.field)
+        for mask, bit in (
+            (self.occupied_mask, _CELL_OCCUPIED),
+            (self.closed_mask, _CELL_SHOT),
+            (self.halo_mask, _CELL_HALO),
+        ):
+            for i in iter_bits(mask):
+                cells[i] |= bit
+        return _pack_snapshot(self, cells)
+
+    def restore(self, data):
+        flags, size, count, cells, field, ships = _unpack_snapshot(data)
+        if size != self.size:
+            self.__init__(size=size)
+        self.hid = bool(flags & _FLAG_HID)
+        self.started = bool(flags & _FLAG_STARTED)
+        self.count = count
+        self.field = field
+        self.occupied_mask = _plane_mask(cells, _OCCUPIED_PLANE)
+        self.closed_mask = _plane_mask(cells, _SHOT_PLANE)
+        self.halo_mask = _plane_mask(cells, _HALO_PLANE)
+        self._unshot = None
+
+        self.ships = []
+        self._owner = {}
+        self.ship_mask = 0
+        for x, y, o, l, lives in ships:
+            ship = Ship(self.grid[x][y], l, o)
+            ship.lives = lives
+            self.ships.append(ship)
+            mask = self.mask_of(ship.dots)
+            self.ship_mask |= mask
+            for i in iter_bits(mask):
+                self._owner[i] = ship
+        return self
+
+    @classmethod
+    def from_snapshot(cls, data):
+        size = _SNAPSHOT_HEADER.unpack_from(data)[3]
+        return cls(size=size).restore(data)
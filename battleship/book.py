@@ -0,0 +1,168 @@
+import argparse
+import mmap
+import os
+import struct
+from functools import lru_cache
+
+from .core import HIT, MISS
+from .heatmap import density_map, np
+from .placement import FleetGeometry
+
+BOOK_MAGIC = b"BSBOOK"
+BOOK_VERSION = 1
+DEFAULT_DEPTH = 12
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+# File layout, little-endian:
+#   header       magic, version, number of lines
+#   per line     board size, depth, ship count, first node, node count,
+#                then one byte per ship length (longest first)
+#   nodes        cell to fire at, node after a miss, node after a hit
+# Node numbers are relative to the line's first node. The root is node 0,
+# so 0 also means "out of book" for a child.
+_HEADER = struct.Struct("<6sBH")
+_LINE = struct.Struct("<HBBII")
+_NODE = struct.Struct("<HHH")
+
+
+def best_shot(size, lengths, blocked, must):
+    # The open cell most ship positions run through; ties go to the
+    # lowest cell so the book is reproducible.
+    # Blocked and must-cover cells always score 0.
+    heat = density_map(size, lengths, blocked, must)
+    if np is not None:
+        heat = heat.tolist()
+    best = None
+    top = 0
+    for cell, h in enumerate(h for row in heat for h in row):
+        if h > top:
+            best, top = cell, h
+    return best
+
+
+def build_line(size, lengths, depth=DEFAULT_DEPTH):
+    # Expand hit and miss after every shot down to depth shots. A sink
+    # leaves the book, so the tree only follows unsunk hits.
+    nodes = []
+
+    def expand(blocked, must, left):
+        cell = best_shot(size, lengths, blocked, must)
+        if cell is None:
+            return 0
+        index = len(nodes)
+        node = [cell, 0, 0]
+        nodes.append(node)
+        if left > 1:
+            x, y = divmod(cell, size)
+            missed = [bytearray(row) for row in blocked]
+            missed[x][y] = 1
+            node[1] = expand(missed, must, left - 1)
+            hit = [bytearray(row) for row in must]
+            hit[x][y] = 1
+            node[2] = expand(blocked, hit, left - 1)
+        return index
+
+    empty = [bytearray(size) for _ in range(size)]
+    expand(empty, [bytearray(size) for _ in range(size)], depth)
+    if len(nodes) > 0xFFFF:
+        raise ValueError(f"{len(nodes)} nodes do not fit a book line; use a smaller depth")
+    return nodes
+
+
+def write_book(path, lines):
+    # lines: (geometry, depth, nodes) per fleet.
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, len(lines)))
+        first = 0
+        for geometry, depth, nodes in lines:
+            f.write(_LINE.pack(geometry.size, depth, len(geometry.lengths), first, len(nodes)))
+            f.write(bytes(geometry.lengths))
+            first += len(nodes)
+        for _, _, nodes in lines:
+            for node in nodes:
+                f.write(_NODE.pack(*node))
+    return path
+
+
+def build_book(path=DEFAULT_BOOK_PATH, presets=None, depth=DEFAULT_DEPTH):
+    if presets is None:
+        from .game import SHIPS_PRESETS
+
+        presets = SHIPS_PRESETS
+    lines = []
+    for size, ships_config in sorted(presets.items()):
+        geometry = FleetGeometry.of(size, ships_config)
+        lines.append((geometry, depth, build_line(size, list(geometry.lengths), depth)))
+    return write_book(path, lines)
+
+
+class OpeningBook:
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self._data, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            self._data.close()
+            raise ValueError(f"unsupported opening book {path}")
+        self.lines = {}
+        offset = _HEADER.size
+        for _ in range(count):
+            size, depth, ships, first, nodes = _LINE.unpack_from(self._data, offset)
+            offset += _LINE.size
+            lengths = tuple(self._data[offset:offset + ships])
+            offset += ships
+            self.lines[FleetGeometry(size, lengths)] = (first, nodes, depth)
+        self._nodes = offset
+
+    def node(self, index):
+        return _NODE.unpack_from(self._data, self._nodes + index * _NODE.size)
+
+    def line(self, size, ships_config):
+        entry = self.lines.get(FleetGeometry.of(size, ships_config))
+        if entry is None or not entry[1]:
+            return None
+        return BookLine(self, entry[0])
+
+    def close(self):
+        self._data.close()
+
+
+class BookLine:
+    # Cursor into one fleet's tree: the shot to fire now, then follow().
+    def __init__(self, book, first):
+        self.book = book
+        self.first = first
+        self.index = 0
+
+    @property
+    def cell(self):
+        return self.book.node(self.first + self.index)[0]
+
+    def follow(self, code):
+        _, after_miss, after_hit = self.book.node(self.first + self.index)
+        nxt = after_miss if code == MISS else after_hit if code == HIT else 0
+        self.index = nxt
+        return bool(nxt)
+
+
+@lru_cache(maxsize=None)
+def default_book():
+    if not os.path.exists(DEFAULT_BOOK_PATH):
+        return None
+    return OpeningBook(DEFAULT_BOOK_PATH)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the opening book for the preset fleets.")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--out", default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args(argv)
+    build_book(args.out, depth=args.depth)
+    book = OpeningBook(args.out)
+    for geometry, (_, nodes, depth) in sorted(book.lines.items(), key=lambda item: item[0].size):
+        print(f"{geometry.size}x{geometry.size} {list(geometry.lengths)}: {nodes} positions, depth {depth}")
+    book.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,47 @@
+import random
+import struct
+from functools import lru_cache
+from itertools import compress
+
+
 class Dot:
+    __slots__ = ("x", "y")
+
+    # Flyweight tables: one shared Dot per cell for every board size seen.
+    _grids = {}
+
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Dot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Dot is immutable")
 
     def __eq__(self, other):
+        if not isinstance(other, Dot):
+            return NotImplemented
         return self.x == other.x and self.y == other.y
 
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def __reduce__(self):
+        return Dot, (self.x, self.y)
+
     def __repr__(self):
         return f"({self.x}, {self.y})"
 
+    @classmethod
+    def grid(cls, size):
+        grid = cls._grids.get(size)
+        if grid is None:
+            grid = tuple(tuple(cls(x, y) for y in range(size)) for x in range(size))
+            cls._grids[size] = grid
+        return grid
+
 
 class BoardException(Exception):
     pass
@@ -28,32 +61,173 @@ class BoardWrongShipException(BoardException):
     pass
 
 
+MISS = 0
+HIT = 1
+SUNK = 2
+
+SHOT_MESSAGES = {
+    MISS: "Мимо!",
+    HIT: "Корабль ранен!",
+    SUNK: "Корабль уничтожен!",
+}
+
+
+class ShotResult:
+    __slots__ = ("code", "dot", "ship", "halo")
+
+    def __init__(self, code, dot, ship=None, halo=()):
+        self.code = code
+        self.dot = dot
+        self.ship = ship
+        self.halo = halo
+
+    @property
+    def repeat(self):
+        # Only a hit that leaves the ship afloat grants another shot.
+        return self.code == HIT
+
+    @property
+    def is_hit(self):
+        return self.code != MISS
+
+    def __repr__(self):
+        return f"ShotResult({self.code}, {self.dot})"
+
+
+class CellPool:
+    # Set of cells with O(1) add, discard, membership and random pick.
+    __slots__ = ("_cells", "_index")
+
+    def __init__(self, cells=()):
+        self._cells = []
+        self._index = {}
+        for d in cells:
+            self.add(d)
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __contains__(self, d):
+        return d in self._index
+
+    def __iter__(self):
+        return iter(self._cells)
+
+    def add(self, d):
+        if d not in self._index:
+            self._index[d] = len(self._cells)
+            self._cells.append(d)
+
+    def discard(self, d):
+        i = self._index.pop(d, None)
+        if i is None:
+            return False
+        last = self._cells.pop()
+        if i < len(self._cells):
+            self._cells[i] = last
+            self._index[last] = i
+        return True
+
+    def choice(self, rng=random):
+        return self._cells[rng.randrange(len(self._cells))]
+
+
 class Ship:
     def __init__(self, bow, l, o):
         self.bow = bow
         self.l = l
         self.o = o
         self.lives = l
+        # Geometry is fixed once a ship is built, so its cells are computed once.
+        self._dots = None
+        self._cells = None
 
     @property
     def dots(self):
-        ship_dots = []
-        for i in range(self.l):
-            cur_x = self.bow.x
-            cur_y = self.bow.y
-
+        if self._dots is None:
             if self.o == 0:
-                cur_x += i
-
+                dx, dy = 1, 0
             elif self.o == 1:
-                cur_y += i
-
-            ship_dots.append(Dot(cur_x, cur_y))
+                dx, dy = 0, 1
+            else:
+                dx, dy = 0, 0
+            self._dots = tuple(
+                Dot(self.bow.x + dx * i, self.bow.y + dy * i) for i in range(self.l)
+            )
+        return self._dots
 
-        return ship_dots
+    @property
+    def cells(self):
+        if self._cells is None:
+            self._cells = frozenset(self.dots)
+        return self._cells
 
     def shooten(self, shot):
-        return shot in self.dots
+        return shot in self.cells
+
+
+# Board snapshot layout (little-endian):
+#   header: magic, version, flags (hid, started), size, count, ship count
+#   cells:  size * size bytes, row-major; bits 0-1 field glyph,
+#           bit 2 occupied during placement, bit 3 closed by a shot,
+#           bit 4 closed by a sunk ship's halo (version 2)
+#   ships:  bow x, bow y, orientation, length, lives for each ship
+SNAPSHOT_MAGIC = b"BS"
+SNAPSHOT_VERSION = 2
+_SNAPSHOT_HEADER = struct.Struct("<2sBBHHH")
+_SNAPSHOT_SHIP = struct.Struct("<HHBHH")
+
+_FLAG_HID = 1
+_FLAG_STARTED = 2
+_CELL_OCCUPIED = 4
+_CELL_SHOT = 8
+_CELL_HALO = 16
+
+_GLYPH_CODES = str.maketrans({"O": "\x00", "■": "\x01", ".": "\x02", "X": "\x03"})
+_CODE_GLYPHS = str.maketrans({chr(code): "O■.X"[code & 3] for code in range(32)})
+_OCCUPIED_PLANE = bytes(1 if code & _CELL_OCCUPIED else 0 for code in range(256))
+_SHOT_PLANE = bytes(1 if code & _CELL_SHOT else 0 for code in range(256))
+_HALO_PLANE = bytes(1 if code & _CELL_HALO else 0 for code in range(256))
+
+
+def _field_cells(field):
+    # One byte per cell with the glyph in the low bits; callers add the
+    # occupied, shot and halo bits.
+    return bytearray("".join("".join(row) for row in field).translate(_GLYPH_CODES), "latin-1")
+
+
+def _pack_snapshot(board, cells):
+    flags = (_FLAG_HID if board.hid else 0) | (_FLAG_STARTED if board.started else 0)
+    parts = [
+        _SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, board.size, board.count, len(board.ships)
+        ),
+        cells,
+    ]
+    for ship in board.ships:
+        parts.append(_SNAPSHOT_SHIP.pack(ship.bow.x, ship.bow.y, ship.o, ship.l, ship.lives))
+    return b"".join(parts)
+
+
+def _unpack_snapshot(data):
+    # (flags, size, count, cells, field, ship records); version 1 snapshots
+    # read the same, only without halo bits.
+    data = memoryview(data)
+    magic, version, flags, size, count, ship_count = _SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or not 1 <= version <= SNAPSHOT_VERSION:
+        raise ValueError("unsupported board snapshot")
+    offset = _SNAPSHOT_HEADER.size
+    cells = bytes(data[offset:offset + size * size])
+    offset += size * size
+    glyphs = cells.decode("latin-1").translate(_CODE_GLYPHS)
+    field = [list(glyphs[x * size:(x + 1) * size]) for x in range(size)]
+    ships = list(_SNAPSHOT_SHIP.iter_unpack(data[offset:offset + ship_count * _SNAPSHOT_SHIP.size]))
+    return flags, size, count, cells, field, ships
+
+
+@lru_cache(maxsize=None)
+def _flat_grid(size):
+    return tuple(d for row in Dot.grid(size) for d in row)
 
 
 class Board:
@@ -64,17 +238,39 @@ class Board:
         self.count = 0
 
         self.field = [["O"] * size for _ in range(size)]
-
-        self.busy = []
+        self.grid = Dot.grid(size)
+
+        # Placement and play use separate structures: occupied holds ship
+        # cells and their halo during setup, shots holds every cell that is
+        # closed during the game (fired at or revealed by a sink contour),
+        # and unshot is the complement of shots. halo is the part of shots
+        # revealed by sink contours.
+        self.occupied = set()
+        self.shots = set()
+        self.halo = set()
+        self.started = False
         self.ships = []
+        self._ship_at = {}
+        self._unshot = None
+
+    @property
+    def busy(self):
+        return self.shots if self.started else self.occupied
+
+    @property
+    def unshot(self):
+        if self._unshot is None:
+            self._unshot = CellPool(d for row in self.grid for d in row if d not in self.shots)
+        return self._unshot
 
     def add_ship(self, ship):
         for d in ship.dots:
-            if self.out(d) or d in self.busy:
+            if self.out(d) or d in self.occupied:
                 raise BoardWrongShipException()
         for d in ship.dots:
             self.field[d.x][d.y] = "■"
-            self.busy.append(d)
+            self.occupied.add(d)
+            self._ship_at[d] = ship
 
         self.ships.append(ship)
         self.contour(ship)
@@ -85,13 +281,22 @@ class Board:
             (0, -1), (0, 0), (0, 1),
             (1, -1), (1, 0), (1, 1)
         ]
+        closed = self.shots if verb else self.occupied
+        added = []
         for d in ship.dots:
             for dx, dy in near:
-                cur = Dot(d.x + dx, d.y + dy)
-                if not(self.out(cur)) and cur not in self.busy:
+                x, y = d.x + dx, d.y + dy
+                if not((0 <= x < self.size) and (0 <= y < self.size)):
+                    continue
+                cur = self.grid[x][y]
+                if cur not in closed:
+                    closed.add(cur)
+                    added.append(cur)
                     if verb:
-                        self.field[cur.x][cur.y] = "."
-                    self.busy.append(cur)
+                        self.halo.add(cur)
+                        self.field[x][y] = "."
+                        self.unshot.discard(cur)
+        return added
 
     def __str__(self):
         res = ""
@@ -110,28 +315,76 @@ class Board:
     def out(self, d):
         return not((0 <= d.x < self.size) and (0 <= d.y < self.size))
 
-    def shot(self, d):
+    def fire(self, d):
         if self.out(d):
             raise BoardOutException()
 
-        if d in self.busy:
+        if d in self.shots:
             raise BoardUsedException()
 
-        self.busy.append(d)
+        self.shots.add(d)
+        self.unshot.discard(d)
 
-        for ship in self.ships:
-            if d in ship.dots:
-                ship.lives -= 1
-                self.field[d.x][d.y] = "X"
-                if ship.lives == 0:
-                    self.count += 1
-                    self.contour(ship, verb=True)
-                    return False, "Корабль уничтожен!"
-                return True, "Корабль ранен!"
+        ship = self._ship_at.get(d)
+        if ship is not None:
+            ship.lives -= 1
+            self.field[d.x][d.y] = "X"
+            if ship.lives == 0:
+                self.count += 1
+                return ShotResult(SUNK, d, ship, self.contour(ship, verb=True))
+            return ShotResult(HIT, d, ship)
 
         self.field[d.x][d.y] = "."
-        return False, "Мимо!"
+        return ShotResult(MISS, d)
+
+    def shot(self, d):
+        result = self.fire(d)
+        return result.repeat, SHOT_MESSAGES[result.code]
+
+    def snapshot(self):
+        size = self.size
+        cells = _field_cells(self.field)
+        for d in self.occupied:
+            cells[d.x * size + d.y] |= _CELL_OCCUPIED
+        for d in self.shots:
+            cells[d.x * size + d.y] |= _CELL_SHOT
+        for d in self.halo:
+            cells[d.x * size + d.y] |= _CELL_HALO
+        return _pack_snapshot(self, cells)
+
+    def restore(self, data):
+        flags, size, count, cells, field, ships = _unpack_snapshot(data)
+        if size != self.size:
+            self.size = size
+            self.grid = Dot.grid(size)
+        self.hid = bool(flags & _FLAG_HID)
+        self.started = bool(flags & _FLAG_STARTED)
+        self.count = count
+
+        self.field = field
+        flat = _flat_grid(size)
+        self.occupied = set(compress(flat, cells.translate(_OCCUPIED_PLANE)))
+        self.shots = set(compress(flat, cells.translate(_SHOT_PLANE)))
+        self.halo = set(compress(flat, cells.translate(_HALO_PLANE)))
+        self._unshot = None
+
+        self.ships = []
+        self._ship_at = {}
+        for x, y, o, l, lives in ships:
+            ship = Ship(self.grid[x][y], l, o)
+            ship.lives = lives
+            self.ships.append(ship)
+            for d in ship.dots:
+                self._ship_at[d] = ship
+        return self
+
+    @classmethod
+    def from_snapshot(cls, data):
+        size = _SNAPSHOT_HEADER.unpack_from(data)[3]
+        return cls(size=size).restore(data)
 
     def begin(self):
-        # After placement, busy is reused to track shots during the game.
-        self.busy = []
+        self.shots = set()
+        self.halo = set()
+        self._unshot = None
+        self.started = True
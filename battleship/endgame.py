@@ -0,0 +1,236 @@
+import time
+from collections import OrderedDict
+
+from .bitboard import iter_bits
+from .placement import placement_table
+
+# The solver takes over once at most ENDGAME_MAX_SHIPS ships and at most
+# ENDGAME_MAX_LAYOUTS layouts fit what has been seen. Enumeration gives up
+# after ENDGAME_MAX_NODES search nodes and solving after ENDGAME_MAX_STATES
+# new positions, and both stop at the move deadline, leaving the move to
+# the live strategy. Positions solved so far stay in the table for the
+# next move.
+ENDGAME_MAX_SHIPS = 3
+ENDGAME_MAX_LAYOUTS = 32
+ENDGAME_MAX_NODES = 20000
+ENDGAME_MAX_STATES = 5000
+TABLE_SIZE = 200000
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class TranspositionTable:
+    # Solved positions with LRU eviction past capacity.
+    def __init__(self, capacity=TABLE_SIZE):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+
+def enumerate_layouts(
+    size, lengths, blocked, hits, limit=ENDGAME_MAX_LAYOUTS, max_nodes=ENDGAME_MAX_NODES, deadline=None
+):
+    # Every placement of the remaining ships that keeps off blocked cells,
+    # covers every hit and leaves no ship fully hit (it would have sunk).
+    # Layouts are tuples of (ship mask, zone mask); None when there are
+    # more than limit of them or the search runs past max_nodes or the
+    # deadline.
+    lengths = sorted(lengths, reverse=True)
+    tables = [placement_table(size, length) for length in lengths]
+    layouts = []
+    chosen = []
+    nodes = 0
+    expired = False
+
+    def place(i, taken, covered, start):
+        nonlocal nodes, expired
+        nodes += 1
+        if nodes > max_nodes or len(layouts) > limit or expired:
+            return
+        if deadline is not None and not nodes % 256 and time.perf_counter() > deadline:
+            expired = True
+            return
+        if i == len(lengths):
+            if covered & hits == hits:
+                layouts.append(tuple(chosen))
+            return
+        table = tables[i]
+        # Ships of equal length are interchangeable: place them in table order.
+        same = i + 1 < len(lengths) and lengths[i + 1] == lengths[i]
+        for j in range(start, len(table)):
+            mask = table.masks[j]
+            if mask & (blocked | taken) or not mask & ~hits:
+                continue
+            chosen.append((mask, table.zones[j]))
+            place(i + 1, taken | table.zones[j], covered | mask, j + 1 if same else 0)
+            chosen.pop()
+
+    place(0, 0, 0, 0)
+    if nodes > max_nodes or len(layouts) > limit or expired:
+        return None
+    return layouts
+
+
+def lower_bound(layouts, hits):
+    # Under each layout every unhit ship cell still takes a shot. Until
+    # the next hit the shots are a fixed sequence and each cell is the
+    # first hit of at most m layouts (m = most layouts sharing a cell), so
+    # the j-th layout to be found waits for at least ceil(j / m) - 1 misses.
+    counts = {}
+    need = 0
+    waiting = 0
+    for cells in layouts:
+        unhit = cells & ~hits
+        if not unhit:
+            continue
+        waiting += 1
+        need += unhit.bit_count()
+        for cell in iter_bits(unhit):
+            counts[cell] = counts.get(cell, 0) + 1
+    if not waiting:
+        return 0.0
+    m = max(counts.values())
+    misses = sum((j + m - 1) // m - 1 for j in range(1, waiting + 1))
+    return (need + misses) / len(layouts)
+
+
+class EndgameSolver:
+    # Exact expected shots to finish over all layouts that are still
+    # possible, each equally likely.
+    #
+    # Ships never touch, so a layout is fixed by its set of ship cells. A
+    # position is then fixed by the layouts left and the cells already
+    # hit: a closed cell that is not a hit holds no ship in any of them,
+    # so the misses themselves do not matter and only unhit ship cells
+    # are worth a shot.
+    def __init__(
+        self,
+        size,
+        max_ships=ENDGAME_MAX_SHIPS,
+        max_layouts=ENDGAME_MAX_LAYOUTS,
+        max_states=ENDGAME_MAX_STATES,
+        table=None,
+    ):
+        self.size = size
+        self.max_ships = max_ships
+        self.max_layouts = max_layouts
+        self.max_states = max_states
+        self.table = table if table is not None else TranspositionTable()
+
+    def solve(self, lengths, closed, hits, deadline=None):
+        # (expected shots, best cell), or None while the position is too
+        # big to solve. closed and hits are cell masks of the enemy board;
+        # deadline is a time.perf_counter() value.
+        if not lengths or len(lengths) > self.max_ships:
+            return None
+        layouts = enumerate_layouts(self.size, lengths, closed & ~hits, hits, limit=self.max_layouts, deadline=deadline)
+        if not layouts:
+            return None
+        ships = {}
+        for layout in layouts:
+            cells = 0
+            for mask, _ in layout:
+                cells |= mask
+            ships[cells] = tuple(mask for mask, _ in layout)
+        self._ships = ships
+        self._states = 0
+        self._deadline = deadline
+        try:
+            return self._solve(frozenset(ships), hits)
+        except _BudgetExceeded:
+            return None
+
+    def choose(self, lengths, closed, hits, deadline=None):
+        solved = self.solve(lengths, closed, hits, deadline)
+        return None if solved is None else solved[1]
+
+    def _check_deadline(self):
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _BudgetExceeded()
+
+    def _solve(self, layouts, hits):
+        key = (layouts, hits)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+        self._states += 1
+        if self._states > self.max_states:
+            raise _BudgetExceeded()
+        self._check_deadline()
+        candidates = 0
+        for cells in layouts:
+            candidates |= cells
+        candidates &= ~hits
+        if not candidates:
+            result = (0.0, None)
+            self.table.put(key, result)
+            return result
+
+        if len(layouts) == 1:
+            result = (float(candidates.bit_count()), next(iter_bits(candidates)))
+            self.table.put(key, result)
+            return result
+
+        # Cells in the most layouts go first so a good answer is found
+        # early and lower_bound() prunes the rest.
+        floor = lower_bound(layouts, hits)
+        order = sorted(iter_bits(candidates), key=lambda c: -sum(cells >> c & 1 for cells in layouts))
+        best, best_cell = float("inf"), None
+        for cell in order:
+            # One cell splits every layout, which is slow with many of them.
+            self._check_deadline()
+            bit = 1 << cell
+            groups = {}
+            for cells in layouts:
+                outcome = None
+                if cells & bit:
+                    outcome = "hit"
+                    for mask in self._ships[cells]:
+                        if mask & bit:
+                            if not mask & ~(hits | bit):
+                                outcome = mask
+                            break
+                groups.setdefault(outcome, []).append(cells)
+            branches = []
+            bound = 1.0
+            for outcome, members in groups.items():
+                after = hits if outcome is None else hits | bit
+                share = len(members) / len(layouts)
+                members = frozenset(members)
+                bound += share * lower_bound(members, after)
+                branches.append((share, members, after))
+            if bound >= best:
+                continue
+            total = 1.0
+            for share, members, after in branches:
+                total += share * self._solve(members, after)[0]
+                if total >= best:
+                    break
+            if total < best:
+                best, best_cell = total, cell
+                if best <= floor + 1e-9:
+                    break
+        result = (best, best_cell)
+        self.table.put(key, result)
+        return result
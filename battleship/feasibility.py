@@ -0,0 +1,128 @@
+from functools import lru_cache
+
+from .placement import FleetGeometry, fleet_tables
+
+# Exact packing search runs only on boards up to this size and stops after
+# this many search nodes; past either limit a fleet that passes the quick
+# bounds is reported as unknown rather than rejected.
+EXACT_MAX_SIZE = 12
+EXACT_MAX_NODES = 200000
+# A fleet left unknown may not fit at all: random placement then gets at
+# most this many attempts of this many steps per ship, so it fails within
+# about a second instead of exhausting the usual attempts.
+UNKNOWN_PLACE_ATTEMPTS = 10
+UNKNOWN_PLACE_STEPS = 100
+
+
+class FleetConfigError(ValueError):
+    pass
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+def quick_check(geometry):
+    size = geometry.size
+    for length in geometry.lengths:
+        if length < 1:
+            return f"ship length must be positive, got {length}"
+        if length > size:
+            return f"a ship of length {length} does not fit on a {size}x{size} board"
+    # Grow every cell into a 2x2 square anchored at it: on a (size + 1)^2
+    # board a ship of length L becomes a disjoint 2 x (L + 1) rectangle.
+    need = sum(2 * (length + 1) for length in geometry.lengths)
+    if need > (size + 1) ** 2:
+        return f"the fleet and its halo need more room than a {size}x{size} board has"
+    # Rectangle corners lie on board cells, so each rectangle spans exactly
+    # one odd line across its width and at least (L + 1) // 2 along its
+    # length, and holds that many of the ((size + 1) // 2)^2 points where
+    # an odd row meets an odd column.
+    odd = (size + 1) // 2
+    if sum((length + 1) // 2 for length in geometry.lengths) > odd * odd:
+        return f"too many ships to keep apart on a {size}x{size} board"
+    return None
+
+
+def exact_search(geometry, max_nodes=EXACT_MAX_NODES):
+    lengths = geometry.lengths
+    if not lengths:
+        return True
+    tables = fleet_tables(geometry)
+    full = (1 << (geometry.size * geometry.size)) - 1
+    remaining = [sum(lengths[i:]) for i in range(len(lengths) + 1)]
+    failed = set()
+    nodes = 0
+
+    def enter(i, blocked, start):
+        # Frame for a new search node, or None when the node is already known
+        # to fail. Raises _BudgetExceeded past max_nodes.
+        nonlocal nodes
+        key = (i, blocked, start)
+        if key in failed:
+            return None
+        if (full & ~blocked).bit_count() < remaining[i]:
+            failed.add(key)
+            return None
+        nodes += 1
+        if nodes > max_nodes:
+            raise _BudgetExceeded()
+        # i, blocked, start, next table index to try
+        return [i, blocked, start, start]
+
+    # Depth-first over an explicit stack: fleets can be longer than the
+    # interpreter's recursion limit allows.
+    try:
+        root = enter(0, 0, 0)
+        stack = [] if root is None else [root]
+        while stack:
+            frame = stack[-1]
+            i, blocked, start, j = frame
+            table = tables[lengths[i]]
+            while j < len(table) and table.masks[j] & blocked:
+                j += 1
+            if j == len(table):
+                failed.add((i, blocked, start))
+                stack.pop()
+                continue
+            frame[3] = j + 1
+            if i + 1 == len(lengths):
+                return True
+            # Ships of equal length are interchangeable: place them in table order.
+            same = lengths[i + 1] == lengths[i]
+            child = enter(i + 1, blocked | table.zones[j], j + 1 if same else 0)
+            if child is not None:
+                stack.append(child)
+        return False
+    except _BudgetExceeded:
+        return None
+
+
+@lru_cache(maxsize=None)
+def fleet_feasibility(geometry):
+    # True / False when decided, None when the fleet passes the quick
+    # bounds but is too large to settle exactly.
+    reason = quick_check(geometry)
+    if reason is not None:
+        return False, reason
+    if geometry.size > EXACT_MAX_SIZE:
+        return None, None
+    found = exact_search(geometry)
+    if found is False:
+        return False, f"the fleet cannot be placed on a {geometry.size}x{geometry.size} board"
+    return found, None
+
+
+def check_fleet(size, ships_config):
+    feasible, reason = fleet_feasibility(FleetGeometry.of(size, ships_config))
+    if feasible is False:
+        raise FleetConfigError(reason)
+    return feasible
+
+
+def placement_budget(feasible, ships, attempts):
+    # (attempts, max_steps per attempt) for random placement of a fleet
+    # check_fleet() reported as feasible; max_steps None is the default.
+    if feasible is None:
+        return min(attempts, UNKNOWN_PLACE_ATTEMPTS), UNKNOWN_PLACE_STEPS * max(ships, 1)
+    return attempts, None
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
-from random import randint
 
-from .core import Board, Dot, Ship, BoardWrongShipException
-from .players import AI, HumanPlayer, User
+from .core import Board
+from .feasibility import FleetConfigError, check_fleet, placement_budget
+from .placement import FleetGeometry, place_fleet
+from .players import HumanPlayer, User
+from .strategies import DEFAULT_STRATEGY, StrategyEngine, get_strategy
 
 SHIPS_PRESETS = {
     6: [3, 2, 2, 1, 1, 1, 1],
@@ -20,14 +22,30 @@ class GameConfig:
     size: int = 6
     mode: str = "pve"
     ships_config: list | None = None
+    ai_strategy: str = DEFAULT_STRATEGY
+
+    def __post_init__(self):
+        get_strategy(self.ai_strategy)
+        check_fleet(self.size, self.resolved_ships_config())
 
     def resolved_ships_config(self):
         if self.ships_config is not None:
             return list(self.ships_config)
         return ships_config_for_size(self.size)
 
+    def geometry(self):
+        return FleetGeometry.of(self.size, self.resolved_ships_config())
+
 
-def create_game(config, ui=None, p1_board=None, p2_board=None, ai_board=None, human_name="Игрок"):
+def create_game(
+    config,
+    ui=None,
+    p1_board=None,
+    p2_board=None,
+    ai_board=None,
+    human_name="Игрок",
+    board_pool=None,
+):
     ships_config = config.resolved_ships_config()
     if config.mode == "pvp":
         return Game.from_boards(
@@ -37,6 +55,7 @@ def create_game(config, ui=None, p1_board=None, p2_board=None, ai_board=None, hu
             mode="pvp",
             p1_board=p1_board,
             p2_board=p2_board,
+            board_pool=board_pool,
         )
     return Game.from_boards(
         size=config.size,
@@ -46,12 +65,23 @@ def create_game(config, ui=None, p1_board=None, p2_board=None, ai_board=None, hu
         p1_board=p1_board,
         ai_board=ai_board,
         human_name=human_name,
+        board_pool=board_pool,
+        ai_strategy=config.ai_strategy,
     )
 
 
 class Game:
-    def __init__(self, size=6, ships_config=None, ui=None, mode="pve"):
+    board_cls = Board
+    board_pool = None
+    place_attempts = 100
+    ai_strategy = DEFAULT_STRATEGY
+
+    def __init__(self, size=6, ships_config=None, ui=None, mode="pve", board_pool=None, ai_strategy=None):
         self.size = size
+        if board_pool is not None:
+            self.board_pool = board_pool
+        if ai_strategy is not None:
+            self.ai_strategy = ai_strategy
         if ui is None:
             from .ui_console import ConsoleUI
             ui = ConsoleUI()
@@ -66,12 +96,13 @@ class Game:
             self.p1 = HumanPlayer(p1_board, p2_board, self.ui, "Игрок 1")
             self.p2 = HumanPlayer(p2_board, p1_board, self.ui, "Игрок 2")
             self.ai = None
+            self.ai_engine = None
             self.us = None
         else:
             pl = self.random_board()
             co = self.random_board()
             co.hid = True
-            self.ai = AI(co, pl, self.ui)
+            self._create_ai(co, pl)
             self.us = User(pl, co, self.ui)
 
     @classmethod
@@ -85,9 +116,15 @@ class Game:
         p2_board=None,
         ai_board=None,
         human_name="Игрок",
+        board_pool=None,
+        ai_strategy=None,
     ):
         game = cls.__new__(cls)
         game.size = size
+        if board_pool is not None:
+            game.board_pool = board_pool
+        if ai_strategy is not None:
+            game.ai_strategy = ai_strategy
         if ui is None:
             from .ui_console import ConsoleUI
             ui = ConsoleUI()
@@ -102,6 +139,7 @@ class Game:
             game.p1 = HumanPlayer(p1_board, p2_board, game.ui, "Игрок 1")
             game.p2 = HumanPlayer(p2_board, p1_board, game.ui, "Игрок 2")
             game.ai = None
+            game.ai_engine = None
             game.us = None
         else:
             if p1_board is None:
@@ -109,30 +147,43 @@ class Game:
             if ai_board is None:
                 ai_board = game.random_board()
             ai_board.hid = True
-            game.ai = AI(ai_board, p1_board, game.ui)
+            game._create_ai(ai_board, p1_board)
             game.us = HumanPlayer(p1_board, ai_board, game.ui, human_name)
         return game
 
+    def _create_ai(self, board, enemy):
+        strategy = get_strategy(self.ai_strategy)
+        self.ai = strategy.create(board, enemy, self.ui, ships_config=self.ships_config)
+        self.ai_engine = StrategyEngine(strategy, self.ai)
+
+    def ai_move(self):
+        return self.ai_engine.move()
+
+    def close(self):
+        # Releases what the AI holds, e.g. a sampling process pool.
+        if self.ai is not None:
+            self.ai.close()
+
     def random_board(self):
-        board = None
-        while board is None:
-            board = self.random_place()
-        return board
+        feasible = check_fleet(self.size, self.ships_config)
+        if self.board_pool is not None:
+            board = self.board_pool.take(self.size, self.ships_config, board_cls=self.board_cls)
+            if board is not None:
+                return board
+        attempts, max_steps = placement_budget(feasible, len(self.ships_config), self.place_attempts)
+        for _ in range(attempts):
+            board = self.random_place(max_steps)
+            if board is not None:
+                return board
+        raise FleetConfigError(
+            f"could not place the fleet on a {self.size}x{self.size} board "
+            f"in {attempts} attempts"
+        )
 
-    def random_place(self):
-        board = Board(size=self.size)
-        attempts = 0
-        for l in self.ships_config:
-            while True:
-                attempts += 1
-                if attempts > 2000:
-                    return None
-                ship = Ship(Dot(randint(0, self.size), randint(0, self.size)), l, randint(0, 1))
-                try:
-                    board.add_ship(ship)
-                    break
-                except BoardWrongShipException:
-                    pass
+    def random_place(self, max_steps=None):
+        board = place_fleet(self.size, self.ships_config, board_cls=self.board_cls, max_steps=max_steps)
+        if board is None:
+            return None
         board.begin()
         return board
 
@@ -181,7 +232,7 @@ class Game:
                     repeat = self.us.move()
                 else:
                     self.ui.announce_turn(user_turn=False)
-                    repeat = self.ai.move()
+                    repeat = self.ai_move()
                 if repeat:
                     num -= 1
 
@@ -196,4 +247,7 @@ class Game:
 
     def start(self):
         self.greet()
-        self.loop()
+        try:
+            self.loop()
+        finally:
+            self.close()
@@ -0,0 +1,85 @@
+import argparse
+import hashlib
+import random
+import struct
+
+from .core import Board
+from .feasibility import FleetConfigError, check_fleet, placement_budget
+from .placement import place_fleet
+
+BATCH_MAGIC = b"BSBATCH"
+BATCH_VERSION = 1
+_BATCH_HEADER = struct.Struct("<7sB")
+_RECORD = struct.Struct("<I")
+PLACE_ATTEMPTS = 100
+
+
+def board_seed(seed, index):
+    # Each board depends only on (seed, index), so workers can take any
+    # index range without coordinating.
+    digest = hashlib.blake2b(struct.pack("<qQ", seed, index), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def generate_board(size, ships_config, seed, index, board_cls=Board):
+    attempts, max_steps = placement_budget(check_fleet(size, ships_config), len(ships_config), PLACE_ATTEMPTS)
+    rng = random.Random(board_seed(seed, index))
+    for _ in range(attempts):
+        board = place_fleet(size, ships_config, rng=rng, board_cls=board_cls, max_steps=max_steps)
+        if board is not None:
+            board.begin()
+            return board
+    raise FleetConfigError(
+        f"could not place the fleet on a {size}x{size} board in {attempts} attempts"
+    )
+
+
+def generate_boards(size, ships_config, count, seed=0, start=0, encode=False, board_cls=Board):
+    for index in range(start, start + count):
+        board = generate_board(size, ships_config, seed, index, board_cls=board_cls)
+        yield board.snapshot() if encode else board
+
+
+def write_boards(path, size, ships_config, count, seed=0, start=0):
+    written = 0
+    with open(path, "wb") as f:
+        f.write(_BATCH_HEADER.pack(BATCH_MAGIC, BATCH_VERSION))
+        for data in generate_boards(size, ships_config, count, seed=seed, start=start, encode=True):
+            f.write(_RECORD.pack(len(data)))
+            f.write(data)
+            written += 1
+    return written
+
+
+def read_boards(path, board_cls=Board):
+    with open(path, "rb") as f:
+        magic, version = _BATCH_HEADER.unpack(f.read(_BATCH_HEADER.size))
+        if magic != BATCH_MAGIC or version != BATCH_VERSION:
+            raise ValueError("unsupported board batch file")
+        while True:
+            head = f.read(_RECORD.size)
+            if not head:
+                return
+            (length,) = _RECORD.unpack(head)
+            yield board_cls.from_snapshot(f.read(length))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate reproducible battleship boards.")
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--ships", type=int, nargs="+", help="ship lengths, preset for size by default")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args(argv)
+
+    from .game import ships_config_for_size
+
+    ships_config = args.ships or ships_config_for_size(args.size)
+    written = write_boards(args.out, args.size, ships_config, args.count, seed=args.seed, start=args.start)
+    print(f"{written} boards -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+import heapq
+import random
+import time
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .core import Dot, MISS, SUNK
+from .placement import placement_table
+from .players import AI
+
+# Above this size placement tables get too large to index per cell, and
+# HeatmapAI recomputes the map with density_map() on every move instead.
+INCREMENTAL_MAX_SIZE = 32
+
+
+def board_masks(board):
+    # Blocked: closed cells no ship afloat can cover (misses, halo, wrecks).
+    # Must-cover: hits on ships still afloat.
+    size = board.size
+    blocked = [bytearray(size) for _ in range(size)]
+    must = [bytearray(size) for _ in range(size)]
+    for d in board.shots:
+        blocked[d.x][d.y] = 1
+    for ship in board.ships:
+        if ship.lives:
+            for d in ship.dots:
+                if blocked[d.x][d.y]:
+                    blocked[d.x][d.y] = 0
+                    must[d.x][d.y] = 1
+    return blocked, must
+
+
+def density_map(size, ships_config, blocked, must=None, use_numpy=True, deadline=None):
+    # Sum over ship lengths and both orientations of the positions free of
+    # blocked cells and, when must-cover cells are given, running through
+    # all of them. Each pass is a sliding-window sum: a prefix sum finds
+    # the open windows, a difference array spreads them over their cells.
+    # None once deadline (a time.perf_counter() value) passes mid-map.
+    fleet = Counter(ships_config)
+    if use_numpy and np is not None:
+        return _density_numpy(size, fleet, blocked, must, deadline)
+    return _density_python(size, fleet, blocked, must, deadline)
+
+
+def _expired(deadline):
+    return deadline is not None and time.perf_counter() > deadline
+
+
+def _density_numpy(size, fleet, blocked, must, deadline=None):
+    blocked = np.asarray(blocked, dtype=bool).reshape(size, size)
+    must = np.zeros((size, size), dtype=bool) if must is None else np.asarray(must, dtype=bool).reshape(size, size)
+    need = int(must.sum())
+    heat = np.zeros((size, size), dtype=np.int64)
+    prefix = np.zeros((size, size + 1), dtype=np.int32)
+    for length, weight in fleet.items():
+        if not weight or length > size:
+            continue
+        for transpose in (False, True) if length > 1 else (False,):
+            if _expired(deadline):
+                return None
+            b = blocked.T if transpose else blocked
+            np.cumsum(b, axis=1, out=prefix[:, 1:])
+            ok = prefix[:, length:] == prefix[:, :-length]
+            if need:
+                m = must.T if transpose else must
+                np.cumsum(m, axis=1, out=prefix[:, 1:])
+                ok &= prefix[:, length:] - prefix[:, :-length] == need
+            diff = np.zeros((size, size + 1), dtype=np.int64)
+            diff[:, :size - length + 1] += ok
+            diff[:, length:] -= ok
+            cover = np.cumsum(diff[:, :size], axis=1)
+            heat += weight * (cover.T if transpose else cover)
+    heat[must] = 0
+    return heat
+
+
+def _density_python(size, fleet, blocked, must, deadline=None):
+    blocked = [list(row) for row in blocked]
+    must = [[0] * size for _ in range(size)] if must is None else [list(row) for row in must]
+    need = sum(map(sum, must))
+    heat = [[0] * size for _ in range(size)]
+    columns = (list(zip(*blocked)), list(zip(*must)))
+    for length, weight in fleet.items():
+        if not weight or length > size:
+            continue
+        for transpose in (False, True) if length > 1 else (False,):
+            b_rows, m_rows = columns if transpose else (blocked, must)
+            for r in range(size):
+                if _expired(deadline):
+                    return None
+                b_prefix = [0]
+                m_prefix = [0]
+                for b, m in zip(b_rows[r], m_rows[r]):
+                    b_prefix.append(b_prefix[-1] + (1 if b else 0))
+                    m_prefix.append(m_prefix[-1] + (1 if m else 0))
+                diff = [0] * (size + 1)
+                for start in range(size - length + 1):
+                    end = start + length
+                    if b_prefix[end] != b_prefix[start]:
+                        continue
+                    if need and m_prefix[end] - m_prefix[start] != need:
+                        continue
+                    diff[start] += weight
+                    diff[end] -= weight
+                run = 0
+                for c in range(size):
+                    run += diff[c]
+                    if transpose:
+                        heat[c][r] += run
+                    else:
+                        heat[r][c] += run
+    for x in range(size):
+        for y in range(size):
+            if must[x][y]:
+                heat[x][y] = 0
+    return heat
+
+
+class DensityMap:
+    # Per-cell count of the ship positions that could still cover it,
+    # summed over the remaining fleet. A position drops out when one of
+    # its cells is closed without a hit (a miss, a revealed halo cell or a
+    # sunk ship), so each shot only touches the positions through the
+    # cells it closed. The best open cell comes off a lazy max-heap.
+    def __init__(self, size, ships_config, rng=random):
+        self.size = size
+        self.rng = rng
+        self.fleet = Counter(ships_config)
+        self.tables = {length: placement_table(size, length) for length in self.fleet}
+        self.valid = {length: bytearray(b"\x01") * len(table) for length, table in self.tables.items()}
+        self.per_length = {}
+        self.heat = [0] * (size * size)
+        self.closed = bytearray(size * size)
+        for length, table in self.tables.items():
+            counts = [0] * (size * size)
+            for j in range(len(table)):
+                for cell in table.cells(j):
+                    counts[cell] += 1
+            self.per_length[length] = counts
+            weight = self.fleet[length]
+            for cell, count in enumerate(counts):
+                self.heat[cell] += weight * count
+        self._heap = [(-h, rng.random(), cell) for cell, h in enumerate(self.heat)]
+        heapq.heapify(self._heap)
+
+    def _push(self, cell):
+        if not self.closed[cell]:
+            heapq.heappush(self._heap, (-self.heat[cell], self.rng.random(), cell))
+
+    def close(self, cell):
+        self.closed[cell] = 1
+
+    def block(self, cell):
+        self.closed[cell] = 1
+        for length, table in self.tables.items():
+            valid = self.valid[length]
+            counts = self.per_length[length]
+            weight = self.fleet[length]
+            for j in table.covering(cell):
+                if not valid[j]:
+                    continue
+                valid[j] = 0
+                for c in table.cells(j):
+                    counts[c] -= 1
+                    if weight:
+                        self.heat[c] -= weight
+                        self._push(c)
+
+    def sink(self, length):
+        if not self.fleet[length]:
+            return
+        self.fleet[length] -= 1
+        for cell, count in enumerate(self.per_length[length]):
+            if count:
+                self.heat[cell] -= count
+                self._push(cell)
+
+    def best(self, deadline=None):
+        # Incremental: a query is cheap enough to ignore the deadline.
+        heap = self._heap
+        while heap:
+            score, _, cell = heap[0]
+            if self.closed[cell] or -score != self.heat[cell]:
+                heapq.heappop(heap)
+                continue
+            return cell
+        return None
+
+    def target(self, hits, deadline=None):
+        # Positions that run through every unresolved hit, weighted by
+        # how many ships of that length are left.
+        hit_mask = 0
+        for cell in hits:
+            hit_mask |= 1 << cell
+        scores = {}
+        for length, table in self.tables.items():
+            weight = self.fleet[length]
+            if not weight or length < len(hits):
+                continue
+            valid = self.valid[length]
+            for j in table.covering(hits[0]):
+                if not valid[j] or table.masks[j] & hit_mask != hit_mask:
+                    continue
+                for c in table.cells(j):
+                    if not self.closed[c]:
+                        scores[c] = scores.get(c, 0) + weight
+        if not scores:
+            return None
+        top = max(scores.values())
+        return self.rng.choice([c for c, s in scores.items() if s == top])
+
+
+class KernelDensity:
+    # Same interface as DensityMap for boards too large for placement
+    # tables: keeps only the blocked cells and reruns density_map() per move.
+    def __init__(self, size, ships_config, rng=random, use_numpy=True):
+        self.size = size
+        self.rng = rng
+        self.use_numpy = use_numpy
+        self.fleet = Counter(ships_config)
+        self.blocked = [bytearray(size) for _ in range(size)]
+        self.closed = bytearray(size * size)
+
+    def close(self, cell):
+        self.closed[cell] = 1
+
+    def block(self, cell):
+        self.closed[cell] = 1
+        self.blocked[cell // self.size][cell % self.size] = 1
+
+    def sink(self, length):
+        if self.fleet[length]:
+            self.fleet[length] -= 1
+
+    def _pick(self, must=None, deadline=None):
+        heat = density_map(self.size, +self.fleet, self.blocked, must, use_numpy=self.use_numpy, deadline=deadline)
+        if heat is None:
+            return None
+        if self.use_numpy and np is not None:
+            flat = heat.ravel()
+            flat[np.frombuffer(self.closed, dtype=np.uint8).astype(bool)] = -1
+            top = int(flat.max())
+            if top <= 0:
+                return None
+            return int(self.rng.choice(np.flatnonzero(flat == top).tolist()))
+        flat = [-1 if self.closed[i] else h for i, h in enumerate(c for row in heat for c in row)]
+        top = max(flat)
+        if top <= 0:
+            return None
+        return self.rng.choice([i for i, h in enumerate(flat) if h == top])
+
+    def best(self, deadline=None):
+        return self._pick(deadline=deadline)
+
+    def target(self, hits, deadline=None):
+        must = [bytearray(self.size) for _ in range(self.size)]
+        for cell in hits:
+            must[cell // self.size][cell % self.size] = 1
+        return self._pick(must, deadline)
+
+
+class HeatmapAI(AI):
+    def __init__(self, board, enemy, ui, choice_func=None, ships_config=None, rng=None):
+        super().__init__(board, enemy, ui, choice_func, ships_config, rng)
+        density_cls = DensityMap if enemy.size <= INCREMENTAL_MAX_SIZE else KernelDensity
+        self.density = density_cls(enemy.size, self.ships_config, rng=self.rng)
+        # How long the last map query took; a move with less time left
+        # than that skips the map.
+        self.map_cost = 0.0
+        # Hits on wounded ships stay open to positions; misses, halo and
+        # wrecks block them, and sunk ships leave the fleet.
+        blocked, _ = board_masks(enemy)
+        size = enemy.size
+        for d in enemy.shots:
+            cell = d.x * size + d.y
+            if blocked[d.x][d.y]:
+                self.density.block(cell)
+            else:
+                self.density.close(cell)
+        for ship in self.sunk:
+            self.density.sink(ship.l)
+
+    def _cell(self, d):
+        return d.x * self.enemy.size + d.y
+
+    def _map_fits(self):
+        left = self.time_left()
+        return left is None or left > self.map_cost
+
+    def _query(self, query, *args):
+        start = time.perf_counter()
+        cell = query(*args, self.deadline)
+        self.map_cost = time.perf_counter() - start
+        return cell
+
+    def ask(self):
+        # When the map cannot finish before the move deadline, the plain
+        # hunt/target choice plays instead.
+        cell = None
+        if self.hits and self._map_fits():
+            cell = self._query(self.density.target, [self._cell(h) for h in self.hits])
+        if cell is None and self._map_fits():
+            cell = self._query(self.density.best)
+        if cell is None:
+            return super().ask()
+        d = Dot.grid(self.enemy.size)[cell // self.enemy.size][cell % self.enemy.size]
+        self._announce(d)
+        return d
+
+    def _process_shot_result(self, result):
+        cell = self._cell(result.dot)
+        if result.code == MISS:
+            self.density.block(cell)
+        else:
+            self.density.close(cell)
+        if result.code == SUNK:
+            for d in result.ship.dots:
+                self.density.block(self._cell(d))
+            for d in result.halo:
+                self.density.block(self._cell(d))
+            self.density.sink(result.ship.l)
+        super()._process_shot_result(result)
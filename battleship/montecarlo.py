@@ -0,0 +1,226 @@
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .core import Dot, MISS, SUNK
+from .generator import board_seed
+from .placement import place_positions, placement_table
+from .players import AI
+
+DEFAULT_SAMPLES = 400
+# Draws per sample before a worker gives up on a position that has
+# (almost) no consistent layouts left.
+SAMPLE_TRIES = 4
+# Samples per job. Each finished job is one refinement round, and a move
+# that runs out of time plays the best cell of the rounds it finished.
+SAMPLE_CHUNK = 25
+
+
+def sample_layout(size, lengths, blocked, hits, rng=random):
+    # One fleet layout that avoids the blocked cells and puts one ship
+    # through every hit. Hits all belong to the one wounded ship, so that
+    # ship is placed first and the rest are packed around it.
+    remaining = list(lengths)
+    chosen = []
+    if hits:
+        hit_mask = 0
+        for cell in hits:
+            hit_mask |= 1 << cell
+        options = []
+        for length in set(remaining):
+            table = placement_table(size, length)
+            for j in table.covering(hits[0]):
+                mask = table.masks[j]
+                if mask & hit_mask == hit_mask and not mask & blocked:
+                    options.append((length, j))
+        if not options:
+            return None
+        length, j = rng.choice(options)
+        remaining.remove(length)
+        chosen.append((length, j))
+        blocked |= placement_table(size, length).zones[j]
+    rest = place_positions(size, remaining, rng=rng, blocked=blocked, max_steps=50 * max(len(remaining), 1))
+    if rest is None:
+        return None
+    return chosen + rest
+
+
+def sample_counts(size, lengths, blocked, hits, seed, samples):
+    # Runs in a worker process: how often each cell holds a ship across
+    # the layouts drawn, and how many layouts that was.
+    rng = random.Random(seed)
+    counts = [0] * (size * size)
+    drawn = 0
+    for _ in range(samples * SAMPLE_TRIES):
+        if drawn == samples:
+            break
+        layout = sample_layout(size, lengths, blocked, hits, rng)
+        if layout is None:
+            continue
+        for length, j in layout:
+            for cell in placement_table(size, length).cells(j):
+                counts[cell] += 1
+        drawn += 1
+    return drawn, counts
+
+
+class MonteCarloAI(AI):
+    def __init__(
+        self,
+        board,
+        enemy,
+        ui,
+        choice_func=None,
+        ships_config=None,
+        samples=DEFAULT_SAMPLES,
+        workers=None,
+        executor=None,
+        seed=None,
+        rng=None,
+    ):
+        super().__init__(board, enemy, ui, choice_func, ships_config, rng)
+        self.fleet = Counter(self.ships_config)
+        self.samples = samples
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.seed = self.rng.randrange(2 ** 62) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.blocked = 0
+        self.drawn = 0
+        self._executor = executor
+        self._own_executor = executor is None
+        self._round = 0
+        size = enemy.size
+        for d in enemy.shots:
+            if enemy.field[d.x][d.y] != "X":
+                self.blocked |= 1 << (d.x * size + d.y)
+        # Wrecks already on the board are blocked and out of the fleet.
+        for ship in self.sunk:
+            for d in ship.dots:
+                self.blocked |= 1 << (d.x * size + d.y)
+            if self.fleet[ship.l]:
+                self.fleet[ship.l] -= 1
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self):
+        if self._executor is not None and self._own_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def _cell(self, d):
+        return d.x * self.enemy.size + d.y
+
+    def _jobs(self, lengths, hits):
+        # Fixed-size jobs seeded by (seed, move, job) draw the same samples
+        # whatever the pool size.
+        for job, start in enumerate(range(0, self.samples, SAMPLE_CHUNK)):
+            seed = board_seed(self.seed, (self._round << 20) | job)
+            share = min(SAMPLE_CHUNK, self.samples - start)
+            yield (self.enemy.size, lengths, self.blocked, hits, seed, share)
+
+    def _finished(self, jobs):
+        if self.workers == 1 and self._own_executor:
+            for job in jobs:
+                yield sample_counts(*job)
+            return
+        # Keep a couple of jobs per worker in flight, so a move that stops
+        # early leaves little queued work behind.
+        executor = self._get_executor()
+        pending = set()
+        rounds = 0
+        try:
+            while True:
+                for job in jobs:
+                    pending.add(executor.submit(sample_counts, *job))
+                    if len(pending) >= 2 * self.workers:
+                        break
+                if not pending:
+                    return
+                # Like the in-process path, the first round always finishes,
+                # however late the move already is.
+                left = self.time_left()
+                done, pending = wait(
+                    pending,
+                    timeout=None if left is None or not rounds else max(left, 0),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    return
+                for future in done:
+                    rounds += 1
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def refine(self):
+        # Yields the summed counts after every finished job until the
+        # sample budget is spent or the next round would pass the deadline.
+        lengths = sorted(self.fleet.elements(), reverse=True)
+        hits = [self._cell(h) for h in self.hits]
+        self._round += 1
+        counts = [0] * (self.enemy.size * self.enemy.size)
+        self.drawn = 0
+        last = time.perf_counter()
+        for drawn, part in self._finished(self._jobs(lengths, hits)):
+            self.drawn += drawn
+            for cell, count in enumerate(part):
+                if count:
+                    counts[cell] += count
+            yield counts
+            now = time.perf_counter()
+            left = self.time_left()
+            if left is not None and left < now - last:
+                return
+            last = now
+
+    def sample_counts(self):
+        counts = [0] * (self.enemy.size * self.enemy.size)
+        for counts in self.refine():
+            pass
+        return counts
+
+    def _best_cell(self, counts):
+        size = self.enemy.size
+        grid = Dot.grid(size)
+        shots = self.enemy.shots
+        best = 0
+        cells = []
+        for cell, count in enumerate(counts):
+            if count < best or not count:
+                continue
+            d = grid[cell // size][cell % size]
+            if d in shots:
+                continue
+            if count > best:
+                best = count
+                cells = []
+            cells.append(d)
+        return self.rng.choice(cells) if cells else None
+
+    def ask(self):
+        # Anytime: every round refines the counts and replaces the best
+        # cell so far, which is what the move plays at the deadline.
+        d = None
+        for counts in self.refine():
+            self.rounds += 1
+            d = self._best_cell(counts) or d
+        if d is None:
+            return super().ask()
+        self._announce(d)
+        return d
+
+    def _process_shot_result(self, result):
+        if result.code == MISS:
+            self.blocked |= 1 << self._cell(result.dot)
+        if result.code == SUNK:
+            for d in list(result.ship.dots) + list(result.halo):
+                self.blocked |= 1 << self._cell(d)
+            if self.fleet[result.ship.l]:
+                self.fleet[result.ship.l] -= 1
+        super()._process_shot_result(result)
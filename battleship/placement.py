@@ -0,0 +1,166 @@
+import random
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .core import Board, Dot, Ship
+
+
+@dataclass(frozen=True)
+class FleetGeometry:
+    # Hashable key for everything that depends only on board size and fleet.
+    size: int
+    lengths: tuple
+
+    @classmethod
+    def of(cls, size, ships_config):
+        return cls(size, tuple(sorted(ships_config, reverse=True)))
+
+
+class PlacementTable:
+    # Every position of one ship length on one board size, as parallel
+    # arrays: bow coordinates, orientation, the ship's cell mask and its
+    # zone mask (cells plus halo). Bit x * size + y stands for Dot(x, y).
+    __slots__ = ("size", "length", "xs", "ys", "os", "masks", "zones", "_covering")
+
+    def __init__(self, size, length, orientations):
+        self.size = size
+        self.length = length
+        self.xs = array("H")
+        self.ys = array("H")
+        self.os = array("B")
+        masks = []
+        zones = []
+        for o in orientations:
+            dx, dy = (1, 0) if o == 0 else (0, 1)
+            for x in range(size - dx * (length - 1)):
+                for y in range(size - dy * (length - 1)):
+                    mask = 0
+                    zone = 0
+                    for i in range(length):
+                        cx, cy = x + dx * i, y + dy * i
+                        mask |= 1 << (cx * size + cy)
+                        for nx in range(max(cx - 1, 0), min(cx + 2, size)):
+                            for ny in range(max(cy - 1, 0), min(cy + 2, size)):
+                                zone |= 1 << (nx * size + ny)
+                    self.xs.append(x)
+                    self.ys.append(y)
+                    self.os.append(o)
+                    masks.append(mask)
+                    zones.append(zone)
+        self.masks = tuple(masks)
+        self.zones = tuple(zones)
+        self._covering = None
+
+    def __len__(self):
+        return len(self.masks)
+
+    def cells(self, i):
+        bow = self.xs[i] * self.size + self.ys[i]
+        step = self.size if self.os[i] == 0 else 1
+        return range(bow, bow + step * self.length, step)
+
+    def covering(self, cell):
+        # Indices of the positions that cover a cell, built on first use.
+        if self._covering is None:
+            covering = [[] for _ in range(self.size * self.size)]
+            for i in range(len(self.masks)):
+                for c in self.cells(i):
+                    covering[c].append(i)
+            self._covering = [tuple(c) for c in covering]
+        return self._covering[cell]
+
+    def open(self, blocked):
+        return [i for i, mask in enumerate(self.masks) if not mask & blocked]
+
+    def ship(self, i):
+        return Ship(Dot(self.xs[i], self.ys[i]), self.length, self.os[i])
+
+
+@lru_cache(maxsize=None)
+def placement_table(size, length, o=None):
+    if o is not None:
+        return PlacementTable(size, length, (o,))
+    # A single cell looks the same in both orientations.
+    return PlacementTable(size, length, (0, 1) if length > 1 else (0,))
+
+
+def fleet_tables(geometry):
+    return {l: placement_table(geometry.size, l) for l in set(geometry.lengths)}
+
+
+def cells_mask(dots, size):
+    mask = 0
+    for d in dots:
+        mask |= 1 << (d.x * size + d.y)
+    return mask
+
+
+def place_fleet(size, ships_config, rng=random, board_cls=Board, max_steps=None, probes=8):
+    chosen = place_positions(size, ships_config, rng=rng, max_steps=max_steps, probes=probes)
+    if chosen is None:
+        return None
+    board = board_cls(size=size)
+    for length, pos in chosen:
+        board.add_ship(placement_table(size, length).ship(pos))
+    return board
+
+
+def place_positions(size, ships_config, rng=random, blocked=0, max_steps=None, probes=8):
+    # Returns (length, table index) per ship, or None. Cells set in
+    # blocked cannot hold a ship but may lie in a ship's halo.
+    #
+    # Ship by ship, pick uniformly among the positions still open; back off
+    # to the previous ship when a length has nowhere left to go. A few
+    # random probes find an open position cheaply on sparse boards; the
+    # full list of open positions is built only when probes keep failing.
+    geometry = FleetGeometry.of(size, ships_config)
+    lengths = geometry.lengths
+    if max_steps is None:
+        max_steps = 1000 * max(len(lengths), 1)
+    tables = fleet_tables(geometry)
+
+    chosen = []
+    # One frame per placed ship: the blocked mask before it, positions
+    # already tried at that level and, once built, the shuffled list of
+    # its remaining open positions.
+    frames = []
+    steps = 0
+    while len(chosen) < len(lengths):
+        level = len(chosen)
+        if len(frames) == level:
+            frames.append([blocked, set(), None])
+        _, tried, options = frames[level]
+        table = tables[lengths[level]]
+
+        steps += 1
+        if steps > max_steps:
+            return None
+
+        pos = None
+        if options is None:
+            for _ in range(probes if len(table) else 0):
+                probe = rng.randrange(len(table))
+                if probe not in tried and not table.masks[probe] & blocked:
+                    pos = probe
+                    break
+            else:
+                options = [i for i in table.open(blocked) if i not in tried]
+                rng.shuffle(options)
+                frames[level][2] = options
+        if pos is None and options:
+            pos = options.pop()
+
+        if pos is None:
+            frames.pop()
+            if not chosen:
+                return None
+            prev = chosen.pop()
+            blocked = frames[-1][0]
+            frames[-1][1].add(prev)
+            continue
+
+        blocked |= table.zones[pos]
+        chosen.append(pos)
+
+    return list(zip(lengths, chosen))
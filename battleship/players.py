@@ -1,6 +1,21 @@
 import random
+import time
+from collections import Counter
+from functools import lru_cache
 
-from .core import BoardException, Dot
+from .core import BoardException, CellPool, Dot, HIT, SUNK, SHOT_MESSAGES
+
+
+@lru_cache(maxsize=None)
+def lattice(size, step):
+    # Cells split by (x + y) % step. Any straight run of step cells holds
+    # one cell of every class, so each class meets every ship that long.
+    classes = [[] for _ in range(step)]
+    grid = Dot.grid(size)
+    for x in range(size):
+        for y in range(size):
+            classes[(x + y) % step].append(grid[x][y])
+    return tuple(tuple(cells) for cells in classes)
 
 
 class Player:
@@ -9,6 +24,11 @@ class Player:
         self.enemy = enemy
         self.ui = ui
 
+    def say(self, message):
+        # Players without a UI play headless and stay silent.
+        if self.ui is not None:
+            self.ui.say(message)
+
     def ask(self):
         raise NotImplementedError()
 
@@ -16,45 +36,198 @@ class Player:
         while True:
             try:
                 target = self.ask()
-                repeat, message = self.enemy.shot(target)
-                self.ui.say(message)
-                return repeat
+                result = self.enemy.fire(target)
+                self.say(SHOT_MESSAGES[result.code])
+                return result.repeat
             except BoardException as e:
-                self.ui.say(str(e))
+                self.say(str(e))
 
 
 class AI(Player):
-    def __init__(self, board, enemy, ui, choice_func=None):
+    def __init__(self, board, enemy, ui, choice_func=None, ships_config=None, rng=None):
         super().__init__(board, enemy, ui)
         self.choice_func = choice_func or random.choice
+        # Source of the AI's own random picks; headless games pass a
+        # seeded random.Random so they never touch the global state.
+        self.rng = rng or random
+        # The fleet is part of the rules, so every AI may know its lengths.
+        if ships_config is None:
+            ships_config = [ship.l for ship in enemy.ships]
+        self.ships_config = list(ships_config)
+        self.afloat = Counter(self.ships_config)
         self.mode = "hunt"
         self.hits = []
         self.candidates = []
         self.orientation = None
+        self.last_result = None
+        self.sunk = []
+        # A board joined mid-game, e.g. one restored from a snapshot, may
+        # already hold wrecks.
+        for ship in enemy.ships:
+            if not ship.lives:
+                self.sunk.append(ship)
+                if self.afloat[ship.l]:
+                    self.afloat[ship.l] -= 1
+        self._lattices = {}
+        # Set by the strategy engine for the move in progress; heavy
+        # strategies stop refining their answer once it passes.
+        self.deadline = None
+        self.book_line = None
+        self.endgame = None
+        self.rounds = 0
+        self.last_report = None
+        # The hunt index costs a pass over the board: build it with the AI,
+        # not inside the first timed move.
+        if enemy.started:
+            self._lattice_pools(self._lattice_step())
+
+    def use_book(self, book):
+        # Only a game that starts from an untouched enemy board can follow
+        # the book from its root.
+        if book is not None and not self.enemy.shots:
+            self.book_line = book.line(self.enemy.size, self.ships_config)
+
+    def _book_move(self):
+        if self.book_line is None:
+            return None
+        cell = self.book_line.cell
+        size = self.enemy.size
+        d = Dot.grid(size)[cell // size][cell % size]
+        if d in self.enemy.shots:
+            self.book_line = None
+            return None
+        self._announce(d)
+        return d
+
+    def _announce(self, d):
+        if self.ui is not None:
+            self.ui.say(f"Ход компьютера: {d.x+1} {d.y+1}")
+
+    def use_endgame(self, solver):
+        self.endgame = solver
+
+    def _endgame_move(self):
+        # Exact play once few enough layouts are left; None until then.
+        if self.endgame is None or self._out_of_time():
+            return None
+        remaining = list(self.ships_config)
+        for ship in self.sunk:
+            remaining.remove(ship.l)
+        if len(remaining) > self.endgame.max_ships:
+            return None
+        size = self.enemy.size
+        closed = 0
+        for d in self.enemy.shots:
+            closed |= 1 << (d.x * size + d.y)
+        hits = 0
+        for d in self.hits:
+            hits |= 1 << (d.x * size + d.y)
+        cell = self.endgame.choose(remaining, closed, hits, self.deadline)
+        if cell is None:
+            return None
+        d = Dot.grid(size)[cell // size][cell % size]
+        self._announce(d)
+        return d
+
+    def close(self):
+        # Strategies that hold workers or other resources release them here.
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def time_left(self):
+        if self.deadline is None:
+            return None
+        return self.deadline - time.perf_counter()
+
+    def _out_of_time(self):
+        left = self.time_left()
+        return left is not None and left <= 0
+
+    def _lattice_pools(self, step):
+        # Open enemy cells of every lattice class, built on first use and
+        # then kept in step with every shot and sink halo.
+        pools = self._lattices.get(step)
+        if pools is None:
+            unshot = self.enemy.unshot
+            pools = tuple(CellPool(d for d in cells if d in unshot) for cells in lattice(self.enemy.size, step))
+            self._lattices[step] = pools
+        return pools
+
+    def _parity_pools(self):
+        return self._lattice_pools(2)
+
+    def _close(self, d):
+        for step, pools in self._lattices.items():
+            pools[(d.x + d.y) % step].discard(d)
+
+    def _lattice_step(self):
+        # The shortest ship afloat sets the lattice. Single-cell ships are
+        # left out: every cell has to be probed to find them anyway, and
+        # the longer ships are found sooner on the sparser lattice first.
+        lengths = [length for length, count in self.afloat.items() if count and length > 1]
+        if lengths:
+            return min(lengths)
+        return 1 if self.afloat[1] else 2
 
     def _available_dots(self):
-        dots = []
-        for x in range(self.enemy.size):
-            for y in range(self.enemy.size):
-                d = Dot(x, y)
-                if d not in self.enemy.busy:
-                    dots.append(d)
-        return dots
+        even, odd = self._parity_pools()
+        return list(even) + list(odd)
+
+    def _hunt_pools(self):
+        # Probe the lattice classes with the fewest open cells: each still
+        # meets every ship afloat and needs the fewest shots to cover. Tied
+        # classes are all offered; the first shot makes its class the
+        # smallest and the hunt stays on it. None once no cell is open.
+        step = self._lattice_step()
+        if step not in self._lattices and self._out_of_time():
+            # A move already past its deadline does not build a new index.
+            return [self.enemy.unshot] if len(self.enemy.unshot) else None
+        pools = [pool for pool in self._lattice_pools(step) if len(pool)]
+        if not pools:
+            return None
+        if not +self.afloat:
+            # No fleet to go by: sweep the classes in order.
+            return pools[:1]
+        fewest = min(len(pool) for pool in pools)
+        return [pool for pool in pools if len(pool) == fewest]
 
     def _hunt_candidates(self):
-        # Checkerboard filter speeds up search for ships of length >= 2.
-        dots = [
-            d for d in self._available_dots()
-            if (d.x + d.y) % 2 == 0
-        ]
-        return dots or self._available_dots()
+        pools = self._hunt_pools()
+        if pools is None:
+            return []
+        return [d for pool in pools for d in pool]
+
+    def _hunt_choice(self):
+        while True:
+            pools = self._hunt_pools()
+            if pools is None:
+                return None
+            if self.choice_func is random.choice:
+                # Tied classes are the same size, so this is uniform over them.
+                d = self.rng.choice(pools).choice(self.rng)
+            else:
+                d = self.choice_func([d for pool in pools for d in pool])
+            if d not in self.enemy.shots:
+                return d
+            # Closed behind our back, e.g. by another player on this board.
+            self._close(d)
 
     def _neighbors(self, d):
         near = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        size = self.enemy.size
+        grid = Dot.grid(size)
         res = []
         for dx, dy in near:
-            cur = Dot(d.x + dx, d.y + dy)
-            if not self.enemy.out(cur) and cur not in self.enemy.busy:
+            x, y = d.x + dx, d.y + dy
+            if not((0 <= x < size) and (0 <= y < size)):
+                continue
+            cur = grid[x][y]
+            if cur not in self.enemy.shots:
                 res.append(cur)
         return res
 
@@ -84,13 +257,14 @@ class AI(Player):
             line = [up, down]
         res = []
         for d in line:
-            if not self.enemy.out(d) and d not in self.enemy.busy:
+            if not self.enemy.out(d) and d not in self.enemy.shots:
                 res.append(d)
         return res
 
-    def _process_shot_result(self, target, message):
-        is_hit = "ранен" in message or "уничтожен" in message
-        is_sink = "уничтожен" in message
+    def _process_shot_result(self, result):
+        is_hit = result.code in (HIT, SUNK)
+        is_sink = result.code == SUNK
+        target = result.dot
         if is_hit:
             self.hits.append(target)
             if self.mode != "target":
@@ -102,6 +276,9 @@ class AI(Player):
                 self.candidates = self._neighbors(target)
         if is_sink:
             # Ship destroyed: reset to search mode.
+            self.sunk.append(result.ship)
+            if self.afloat[result.ship.l]:
+                self.afloat[result.ship.l] -= 1
             self.mode = "hunt"
             self.hits = []
             self.candidates = []
@@ -111,20 +288,68 @@ class AI(Player):
         if self.mode == "target" and self.candidates:
             d = self.candidates.pop(0)
         else:
-            d = self.choice_func(self._hunt_candidates())
-        self.ui.say(f"Ход компьютера: {d.x+1} {d.y+1}")
+            d = self._hunt_choice()
+        if d is None:
+            # The hunt index has nothing open; any open cell will do.
+            pool = self.enemy.unshot
+            if self.choice_func is random.choice:
+                d = pool.choice(self.rng)
+            else:
+                d = self.choice_func(list(pool))
+        self._announce(d)
         return d
 
+    def _choose(self):
+        # Book, then exact endgame, then the strategy's own search. Search
+        # strategies count their refinement rounds in self.rounds.
+        start = time.perf_counter()
+        self.rounds = 0
+        target = self._book_move()
+        source = "book"
+        if target is None:
+            target = self._endgame_move()
+            source = "endgame"
+            self.rounds = 1
+        if target is None:
+            self.rounds = 0
+            target = self.ask()
+            source = "search"
+            self.rounds = max(self.rounds, 1)
+        self.last_report = {
+            "source": source,
+            "rounds": self.rounds,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+        }
+        return target
+
     def move(self):
         while True:
             try:
-                target = self.ask()
-                repeat, message = self.enemy.shot(target)
-                self._process_shot_result(target, message)
-                self.ui.say(message)
-                return repeat
+                target = self._choose()
+                result = self.enemy.fire(target)
+                self.last_result = result
+                if self.book_line is not None and not self.book_line.follow(result.code):
+                    self.book_line = None
+                self._close(result.dot)
+                for d in result.halo:
+                    self._close(d)
+                self._process_shot_result(result)
+                self.say(SHOT_MESSAGES[result.code])
+                return result.repeat
             except BoardException as e:
-                self.ui.say(str(e))
+                self.say(str(e))
+
+
+class RandomAI(AI):
+    # Fires at any open cell and never follows up on a hit.
+    def ask(self):
+        pool = self.enemy.unshot
+        if self.choice_func is random.choice:
+            d = pool.choice(self.rng)
+        else:
+            d = self.choice_func(list(pool))
+        self._announce(d)
+        return d
 
 
 class User(Player):
@@ -0,0 +1,112 @@
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .core import Board
+from .feasibility import check_fleet
+from .generator import generate_board
+from .placement import FleetGeometry
+
+
+def _build(size, ships_config, seed, index):
+    # Runs in a worker process; snapshots keep the transfer compact.
+    return generate_board(size, ships_config, seed, index).snapshot()
+
+
+class BoardPool:
+    def __init__(self, capacity=4, workers=None, executor=None, seed=None):
+        self.capacity = capacity
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.seed = random.randrange(2 ** 62) if seed is None else seed
+        self.hits = 0
+        self.misses = 0
+        self._executor = executor
+        self._own_executor = executor is None
+        self._ready = {}
+        self._pending = {}
+        self._index = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def prefill(self, size, ships_config):
+        check_fleet(size, ships_config)
+        key = FleetGeometry.of(size, ships_config)
+        with self._lock:
+            if self._closed:
+                return 0
+            ready = self._ready.setdefault(key, deque())
+            pending = self._pending.setdefault(key, set())
+            missing = self.capacity - len(ready) - len(pending)
+            jobs = []
+            for _ in range(max(missing, 0)):
+                jobs.append(self._index)
+                self._index += 1
+        executor = self._get_executor()
+        for index in jobs:
+            future = executor.submit(_build, size, list(key.lengths), self.seed, index)
+            with self._lock:
+                pending.add(future)
+            future.add_done_callback(lambda f, key=key: self._collect(key, f))
+        return len(jobs)
+
+    def _collect(self, key, future):
+        with self._lock:
+            self._pending.get(key, set()).discard(future)
+            if self._closed:
+                return
+            if future.cancelled() or future.exception() is not None:
+                # A failed build only leaves a gap; take() falls back anyway.
+                return
+            data = future.result()
+            self._ready[key].append(data)
+
+    def take(self, size, ships_config, board_cls=Board):
+        key = FleetGeometry.of(size, ships_config)
+        with self._lock:
+            ready = self._ready.get(key)
+            data = ready.popleft() if ready else None
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        self.prefill(size, ships_config)
+        if data is None:
+            return None
+        return board_cls.from_snapshot(data)
+
+    def ready(self, size, ships_config):
+        with self._lock:
+            return len(self._ready.get(FleetGeometry.of(size, ships_config), ()))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "ready": sum(len(q) for q in self._ready.values()),
+                "pending": sum(len(p) for p in self._pending.values()),
+            }
+
+    def cancel(self):
+        with self._lock:
+            self._closed = True
+            pending = [f for futures in self._pending.values() for f in futures]
+            self._ready.clear()
+        for future in pending:
+            future.cancel()
+        if self._executor is not None and self._own_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cancel()
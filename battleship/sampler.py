@@ -0,0 +1,193 @@
+import random
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from .core import Board
+from .placement import FleetGeometry, placement_table
+
+# A layer is every (blocked window, ships left) state after one cell; past
+# this many states counting is abandoned and CountLimitExceeded is raised.
+DEFAULT_MAX_STATES = 1000000
+
+
+class CountLimitExceeded(Exception):
+    pass
+
+
+class FleetSampler:
+    # Counts fleet layouts exactly with a cell-by-cell dynamic program and
+    # draws layouts uniformly from that count.
+    #
+    # Cells are scanned in row-major order and every ship is placed at its
+    # bow, so a layout is one path through the scan. A state is packed into
+    # one int: the blocked cells from the current one onward (ship cells
+    # and halo of ships already placed) above the mixed-radix count of
+    # ships left of each length. Completion counts are kept only at row
+    # boundaries; sampling rebuilds the few states inside a row it needs.
+    def __init__(self, size, ships_config, max_states=DEFAULT_MAX_STATES):
+        self.geometry = FleetGeometry.of(size, ships_config)
+        self.size = size
+        self.max_states = max_states
+
+        fleet = Counter(self.geometry.lengths)
+        self.lengths = sorted(fleet, reverse=True)
+        weights = []
+        radix = 1
+        for length in self.lengths:
+            weights.append(radix)
+            radix *= fleet[length] + 1
+        self._rem_bits = radix.bit_length()
+        self._rem_mask = (1 << self._rem_bits) - 1
+        self._start = sum(fleet[l] * w for l, w in zip(self.lengths, weights))
+
+        # For each cell: the ship positions with their bow there, as
+        # (radix weight, radix base, mask and zone shifted to the bow, length, table index).
+        self._moves = [[] for _ in range(size * size)]
+        for length, weight in zip(self.lengths, weights):
+            table = placement_table(size, length)
+            for j in range(len(table)):
+                bow = table.xs[j] * size + table.ys[j]
+                self._moves[bow].append((
+                    weight,
+                    fleet[length] + 1,
+                    table.masks[j] >> bow,
+                    table.zones[j] >> bow,
+                    length,
+                    j,
+                ))
+
+        self._completions = self._count()
+        self.total = self._completions[0].get(self._start, 0)
+
+    def _expand(self, i, layer, counts=True):
+        rem_bits = self._rem_bits
+        rem_mask = self._rem_mask
+        nxt = defaultdict(int) if counts else set()
+        moves = self._moves[i]
+        for key in layer:
+            weight_in = layer[key] if counts else 1
+            rem = key & rem_mask
+            window = key >> rem_bits
+            skip = ((window >> 1) << rem_bits) | rem
+            if counts:
+                nxt[skip] += weight_in
+            else:
+                nxt.add(skip)
+            if window & 1 or not rem:
+                continue
+            for weight, base, mask, zone, _, _ in moves:
+                if (rem // weight) % base and not mask & window:
+                    placed = (((window | zone) >> 1) << rem_bits) | (rem - weight)
+                    if counts:
+                        nxt[placed] += weight_in
+                    else:
+                        nxt.add(placed)
+        if len(nxt) > self.max_states:
+            raise CountLimitExceeded(
+                f"more than {self.max_states} states while counting "
+                f"{list(self.geometry.lengths)} on a {self.size}x{self.size} board"
+            )
+        return nxt
+
+    def _count(self):
+        size = self.size
+        # Forward: the states reachable at every row boundary.
+        boundaries = [{self._start}]
+        layer = {self._start}
+        for row in range(size):
+            for col in range(size):
+                layer = self._expand(row * size + col, layer, counts=False)
+            boundaries.append(layer)
+
+        # Backward: completions at each boundary, rebuilding one row of
+        # intra-row layers at a time.
+        completions = [None] * (size + 1)
+        completions[size] = {key: 1 for key in boundaries[size] if not key & self._rem_mask}
+        for row in range(size - 1, -1, -1):
+            layers = [boundaries[row]]
+            for col in range(size - 1):
+                layers.append(self._expand(row * size + col, layers[-1], counts=False))
+            after = completions[row + 1]
+            for col in range(size - 1, -1, -1):
+                before = {}
+                for key in layers[col]:
+                    total = sum(
+                        after.get(nxt, 0) for nxt, _ in self._successors(row * size + col, key)
+                    )
+                    if total:
+                        before[key] = total
+                after = before
+            completions[row] = after
+        return completions
+
+    def _successors(self, i, key):
+        rem_bits = self._rem_bits
+        rem = key & self._rem_mask
+        window = key >> rem_bits
+        yield ((window >> 1) << rem_bits) | rem, None
+        if window & 1 or not rem:
+            return
+        for weight, base, mask, zone, length, j in self._moves[i]:
+            if (rem // weight) % base and not mask & window:
+                yield (((window | zone) >> 1) << rem_bits) | (rem - weight), (length, j)
+
+    def sample_positions(self, rng=random):
+        if not self.total:
+            raise ValueError("no layouts to sample")
+        size = self.size
+        key = self._start
+        chosen = []
+        for row in range(size):
+            after = self._completions[row + 1]
+            memo = {}
+
+            def completions(col, key):
+                if col == size:
+                    return after.get(key, 0)
+                cached = memo.get((col, key))
+                if cached is None:
+                    cached = sum(
+                        completions(col + 1, nxt)
+                        for nxt, _ in self._successors(row * size + col, key)
+                    )
+                    memo[(col, key)] = cached
+                return cached
+
+            for col in range(size):
+                options = [
+                    (completions(col + 1, nxt), nxt, move)
+                    for nxt, move in self._successors(row * size + col, key)
+                ]
+                pick = rng.randrange(sum(weight for weight, _, _ in options))
+                for weight, nxt, move in options:
+                    if pick < weight:
+                        break
+                    pick -= weight
+                key = nxt
+                if move is not None:
+                    chosen.append(move)
+        return chosen
+
+    def sample(self, rng=random, board_cls=Board):
+        board = board_cls(size=self.size)
+        for length, j in self.sample_positions(rng):
+            board.add_ship(placement_table(self.size, length).ship(j))
+        board.begin()
+        return board
+
+    def samples(self, count, rng=random, board_cls=Board):
+        for _ in range(count):
+            yield self.sample(rng, board_cls=board_cls)
+
+
+@lru_cache(maxsize=16)
+def _cached_sampler(geometry, max_states):
+    return FleetSampler(geometry.size, list(geometry.lengths), max_states=max_states)
+
+
+def fleet_sampler(size, ships_config, max_states=DEFAULT_MAX_STATES):
+    return _cached_sampler(FleetGeometry.of(size, ships_config), max_states)
+
+
+def count_layouts(size, ships_config, max_states=DEFAULT_MAX_STATES):
+    return fleet_sampler(size, ships_config, max_states=max_states).total
@@ -0,0 +1,153 @@
+import argparse
+import random
+import statistics
+import time
+from collections import Counter
+
+from .feasibility import check_fleet
+from .generator import board_seed, generate_board
+from .strategies import DEFAULT_STRATEGY, StrategyEngine, get_strategy
+
+DEFAULT_GAMES = 1000
+DEFAULT_SIZE = 10
+HISTOGRAM_ROWS = 20
+HISTOGRAM_WIDTH = 40
+
+
+def play_game(size, ships_config, strategies=(DEFAULT_STRATEGY, DEFAULT_STRATEGY), seed=0, index=0, budgets=False):
+    # One AI-vs-AI game with no UI: (winner, shots fired by each side).
+    # Boards and the AIs' random picks depend only on (seed, index) and
+    # each AI draws from its own random.Random, so the global state is
+    # left alone. Moves go through the strategy engine; with budgets the
+    # AIs cut their search at the wall-clock deadline as in a real game,
+    # which makes the result depend on machine load. The sides take turns
+    # to open so neither keeps the first move.
+    fleet = list(ships_config)
+    boards = [generate_board(size, fleet, seed, 2 * index + side) for side in (0, 1)]
+    engines = []
+    try:
+        for side, name in enumerate(strategies):
+            strategy = get_strategy(name)
+            # The top index bit keeps the AIs' streams apart from the boards'.
+            rng = random.Random(board_seed(seed, (1 << 63) | (2 * index + side)))
+            ai = strategy.create(boards[side], boards[1 - side], None, ships_config=fleet, rng=rng)
+            engines.append(StrategyEngine(strategy, ai, timed=budgets))
+        shots = [0, 0]
+        side = index % 2
+        while True:
+            repeat = engines[side].move()
+            shots[side] += 1
+            if boards[1 - side].count == len(fleet):
+                return side, shots
+            if not repeat:
+                side = 1 - side
+    finally:
+        for engine in engines:
+            engine.ai.close()
+
+
+def simulate(
+    games, size, ships_config, strategies=(DEFAULT_STRATEGY, DEFAULT_STRATEGY), seed=0, start=0, budgets=False
+):
+    check_fleet(size, ships_config)
+    wins = [0, 0]
+    to_win = Counter()
+    began = time.perf_counter()
+    for index in range(start, start + games):
+        winner, shots = play_game(size, ships_config, strategies, seed, index, budgets)
+        wins[winner] += 1
+        to_win[shots[winner]] += 1
+    elapsed = time.perf_counter() - began
+    return {
+        "games": games,
+        "size": size,
+        "ships_config": list(ships_config),
+        "strategies": list(strategies),
+        "seed": seed,
+        "budgets": budgets,
+        "elapsed": elapsed,
+        "games_per_sec": games / elapsed if elapsed else 0.0,
+        "wins": wins,
+        "shots_to_win": to_win,
+    }
+
+
+def summary(to_win):
+    shots = sorted(to_win.elements())
+    if not shots:
+        return {}
+    deciles = statistics.quantiles(shots, n=10) if len(shots) > 1 else [shots[0]] * 9
+    return {
+        "mean": statistics.fmean(shots),
+        "stdev": statistics.pstdev(shots),
+        "min": shots[0],
+        "p10": deciles[0],
+        "median": statistics.median(shots),
+        "p90": deciles[-1],
+        "max": shots[-1],
+    }
+
+
+def histogram(to_win, rows=HISTOGRAM_ROWS, width=HISTOGRAM_WIDTH):
+    if not to_win:
+        return []
+    low, high = min(to_win), max(to_win)
+    step = max(1, -(-(high - low + 1) // rows))
+    buckets = Counter()
+    for shots, count in to_win.items():
+        buckets[low + (shots - low) // step * step] += count
+    top = max(buckets.values())
+    lines = []
+    for first in range(low, high + 1, step):
+        count = buckets[first]
+        label = f"{first}" if step == 1 else f"{first}-{first + step - 1}"
+        lines.append(f"{label:>9} {count:>7} {'#' * round(count / top * width)}")
+    return lines
+
+
+def report(result):
+    a, b = result["strategies"]
+    stats = summary(result["shots_to_win"])
+    lines = [
+        f"{result['games']} games {a} vs {b} on {result['size']}x{result['size']} "
+        f"{result['ships_config']}, seed {result['seed']}",
+        f"{result['elapsed']:.2f} s, {result['games_per_sec']:.1f} games/s",
+        f"wins: {a} {result['wins'][0]}, {b} {result['wins'][1]}",
+    ]
+    if stats:
+        lines.append(
+            "shots to win: mean {mean:.2f}, stdev {stdev:.2f}, min {min}, p10 {p10:g}, "
+            "median {median:g}, p90 {p90:g}, max {max}".format(**stats)
+        )
+        lines.extend(histogram(result["shots_to_win"]))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from .game import ships_config_for_size
+
+    parser = argparse.ArgumentParser(description="Play AI-vs-AI games with no UI and report throughput.")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES)
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--fleet", help="ship lengths, e.g. 4,3,3,2 (default: the preset for the size)")
+    parser.add_argument("--strategy", default=DEFAULT_STRATEGY, help="strategy name or tier of the first AI")
+    parser.add_argument("--vs", help="strategy of the second AI (default: same as the first)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--budgets", action="store_true", help="cut each move at its strategy's time budget (not reproducible)"
+    )
+    args = parser.parse_args(argv)
+    if args.fleet:
+        ships_config = [int(length) for length in args.fleet.split(",")]
+    else:
+        ships_config = ships_config_for_size(args.size)
+    strategies = (args.strategy, args.vs or args.strategy)
+    for name in strategies:
+        get_strategy(name)
+    result = simulate(args.games, args.size, ships_config, strategies, args.seed, budgets=args.budgets)
+    print(report(result))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import time
+from dataclasses import dataclass, field
+
+from .book import default_book
+from .endgame import EndgameSolver
+from .heatmap import HeatmapAI
+from .montecarlo import MonteCarloAI
+from .players import AI, RandomAI
+
+TIERS = ("easy", "normal", "hard", "expert")
+DEFAULT_STRATEGY = "hunt"
+
+
+@dataclass(frozen=True)
+class Strategy:
+    name: str
+    tier: str
+    # Compute budget per move; heavy strategies stop refining at it.
+    budget_ms: float
+    factory: type
+    options: dict = field(default_factory=dict)
+    # Open from the opening book when one covers the fleet.
+    book: bool = False
+    # Play the last ships out with the exact endgame solver.
+    endgame: bool = False
+
+    def create(self, board, enemy, ui, **options):
+        ai = self.factory(board, enemy, ui, **{**self.options, **options})
+        if self.book:
+            ai.use_book(default_book())
+        if self.endgame:
+            ai.use_endgame(EndgameSolver(enemy.size))
+        return ai
+
+
+STRATEGIES = {}
+
+
+def register_strategy(name, factory, tier, budget_ms, book=False, endgame=False, **options):
+    if tier not in TIERS:
+        raise ValueError(f"unknown difficulty tier {tier!r}")
+    STRATEGIES[name] = Strategy(name, tier, budget_ms, factory, options, book, endgame)
+    return STRATEGIES[name]
+
+
+def get_strategy(name):
+    # A name picks a strategy; a tier picks the first strategy registered
+    # for it.
+    if name is None:
+        name = DEFAULT_STRATEGY
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    for strategy in STRATEGIES.values():
+        if strategy.tier == name:
+            return strategy
+    raise ValueError(f"unknown AI strategy {name!r}")
+
+
+def strategies_for_tier(tier):
+    return [s for s in STRATEGIES.values() if s.tier == tier]
+
+
+register_strategy("random", RandomAI, "easy", 5)
+register_strategy("hunt", AI, "normal", 5)
+register_strategy("heatmap", HeatmapAI, "hard", 50, book=True)
+# The registered sampler stays in-process: starting a pool would eat the
+# first 250 ms move, and sim and tournament build an AI per game while
+# already spreading games over processes. Pass workers= to create() for a
+# pool; Game.close() shuts it down.
+register_strategy("montecarlo", MonteCarloAI, "expert", 250, book=True, endgame=True, samples=2000, workers=1)
+
+
+class StrategyEngine:
+    # Runs AI moves under the strategy's budget: the AI gets a deadline to
+    # cut its own search short, and moves that still run over are counted.
+    # Untimed engines only keep the stats, so a search does its full fixed
+    # amount of work and a seeded game plays out the same every time.
+    def __init__(self, strategy, ai, timed=True):
+        self.strategy = strategy
+        self.ai = ai
+        self.timed = timed
+        self.moves = 0
+        self.overruns = 0
+        self.elapsed = 0.0
+        self.worst = 0.0
+        self.rounds = 0
+        self.last_report = None
+
+    def move(self):
+        budget = self.strategy.budget_ms / 1000
+        start = time.perf_counter()
+        if self.timed:
+            self.ai.deadline = start + budget
+        try:
+            return self.ai.move()
+        finally:
+            self.ai.deadline = None
+            spent = time.perf_counter() - start
+            self.moves += 1
+            self.elapsed += spent
+            self.worst = max(self.worst, spent)
+            if spent > budget:
+                self.overruns += 1
+            # The AI reports how it chose; the engine adds the wall time of
+            # the whole move, shot included.
+            report = dict(getattr(self.ai, "last_report", None) or {})
+            report["move_ms"] = spent * 1000
+            report["budget_ms"] = self.strategy.budget_ms
+            self.rounds += report.get("rounds", 0)
+            self.last_report = report
+
+    def stats(self):
+        return {
+            "strategy": self.strategy.name,
+            "budget_ms": self.strategy.budget_ms,
+            "moves": self.moves,
+            "overruns": self.overruns,
+            "mean_ms": self.elapsed / self.moves * 1000 if self.moves else 0.0,
+            "worst_ms": self.worst * 1000,
+            "mean_rounds": self.rounds / self.moves if self.moves else 0.0,
+        }
@@ -0,0 +1,296 @@
+import argparse
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import combinations
+
+from .feasibility import check_fleet
+from .sim import play_game
+from .strategies import get_strategy
+
+DEFAULT_GAMES = 1000
+# Games per batch: big enough that a worker spends its time playing, small
+# enough that the load stays even across cores to the end.
+BATCH_GAMES = 200
+# Two-sided 95% normal quantile for the confidence intervals.
+Z95 = 1.959964
+
+
+def play_batch(size, ships_config, strategies, seed, start, count, budgets=False):
+    # Runs in a worker process and plays games start .. start + count - 1.
+    # Only totals travel back: per side the wins, and the sum and sum of
+    # squares of its shots in the games it won. Without budgets the totals
+    # do not depend on how the games are split or on the machine load.
+    wins = [0, 0]
+    shots = [0, 0]
+    squares = [0, 0]
+    for index in range(start, start + count):
+        winner, fired = play_game(size, ships_config, strategies, seed, index, budgets)
+        wins[winner] += 1
+        shots[winner] += fired[winner]
+        squares[winner] += fired[winner] ** 2
+    return wins[0], wins[1], shots[0], shots[1], squares[0], squares[1]
+
+
+def wilson_interval(wins, games, z=Z95):
+    if not games:
+        return 0.0, 1.0
+    p = wins / games
+    denom = 1 + z * z / games
+    centre = (p + z * z / (2 * games)) / denom
+    half = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def mean_interval(total, squares, count, z=Z95):
+    # Mean with a normal-approximation interval; None without samples.
+    if not count:
+        return None
+    mean = total / count
+    if count == 1:
+        return mean, mean, mean
+    variance = max(squares - total * total / count, 0) / (count - 1)
+    half = z * math.sqrt(variance / count)
+    return mean, mean - half, mean + half
+
+
+def pairings(strategies, mode="round-robin"):
+    if mode == "head-to-head":
+        if len(strategies) != 2:
+            raise ValueError("head-to-head needs exactly two strategies")
+        return [tuple(strategies)]
+    if mode != "round-robin":
+        raise ValueError(f"unknown tournament mode {mode!r}")
+    if len(strategies) < 2:
+        raise ValueError("a tournament needs at least two strategies")
+    return list(combinations(strategies, 2))
+
+
+class Matchup:
+    # Running totals for one pairing on one board size.
+    def __init__(self, size, ships_config, strategies):
+        self.size = size
+        self.ships_config = list(ships_config)
+        self.strategies = tuple(strategies)
+        self.games = 0
+        self.wins = [0, 0]
+        self.shots = [0, 0]
+        self.squares = [0, 0]
+
+    def add(self, count, batch):
+        self.games += count
+        for side in (0, 1):
+            self.wins[side] += batch[side]
+            self.shots[side] += batch[2 + side]
+            self.squares[side] += batch[4 + side]
+
+    def win_rate(self, side=0):
+        rate = self.wins[side] / self.games if self.games else 0.0
+        return (rate, *wilson_interval(self.wins[side], self.games))
+
+    def shots_to_win(self, side=0):
+        return mean_interval(self.shots[side], self.squares[side], self.wins[side])
+
+    def as_dict(self):
+        return {
+            "size": self.size,
+            "ships_config": self.ships_config,
+            "strategies": list(self.strategies),
+            "games": self.games,
+            "wins": list(self.wins),
+            "win_rate": [self.win_rate(side) for side in (0, 1)],
+            "shots_to_win": [self.shots_to_win(side) for side in (0, 1)],
+        }
+
+
+class Tournament:
+    def __init__(
+        self,
+        strategies,
+        presets=None,
+        games=DEFAULT_GAMES,
+        mode="round-robin",
+        seed=0,
+        workers=None,
+        batch=BATCH_GAMES,
+        executor=None,
+        budgets=False,
+    ):
+        if presets is None:
+            from .game import SHIPS_PRESETS
+
+            presets = SHIPS_PRESETS
+        for name in strategies:
+            get_strategy(name)
+        for size, ships_config in presets.items():
+            check_fleet(size, ships_config)
+        self.pairs = pairings(list(strategies), mode)
+        self.presets = {size: list(presets[size]) for size in sorted(presets)}
+        self.games = games
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.batch = batch
+        self.budgets = budgets
+        self.elapsed = 0.0
+        self._executor = executor
+        self._own_executor = executor is None
+        # Every pairing plays games 0 .. games - 1 of the same seed, so all
+        # strategies meet the same boards.
+        self.matchups = {
+            (size, pair): Matchup(size, ships_config, pair)
+            for size, ships_config in self.presets.items()
+            for pair in self.pairs
+        }
+
+    def _jobs(self):
+        for (size, pair), matchup in self.matchups.items():
+            for start in range(0, self.games, self.batch):
+                count = min(self.batch, self.games - start)
+                yield (size, pair), count, (size, matchup.ships_config, pair, self.seed, start, count, self.budgets)
+
+    def _finished(self, jobs):
+        if self.workers == 1 and self._own_executor:
+            for key, count, job in jobs:
+                yield key, count, play_batch(*job)
+            return
+        # A bounded queue of batches per worker keeps every core busy while
+        # results stream back as soon as each batch is done.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        pending = {}
+        try:
+            while True:
+                for key, count, job in jobs:
+                    pending[self._executor.submit(play_batch, *job)] = (key, count)
+                    if len(pending) >= 2 * self.workers:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, count = pending.pop(future)
+                    yield key, count, future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def run(self, progress=None):
+        # progress(played, total) is called after every batch.
+        total = self.games * len(self.matchups)
+        played = 0
+        began = time.perf_counter()
+        try:
+            for key, count, batch in self._finished(self._jobs()):
+                self.matchups[key].add(count, batch)
+                played += count
+                if progress is not None:
+                    progress(played, total)
+        finally:
+            self.elapsed = time.perf_counter() - began
+        return self.results()
+
+    def close(self):
+        if self._executor is not None and self._own_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def standings(self, size):
+        # Totals per strategy over all its pairings on one board size.
+        table = {}
+        for pair in self.pairs:
+            matchup = self.matchups[(size, pair)]
+            for side, name in enumerate(pair):
+                row = table.setdefault(name, [0, 0, 0, 0])
+                row[0] += matchup.games
+                row[1] += matchup.wins[side]
+                row[2] += matchup.shots[side]
+                row[3] += matchup.squares[side]
+        return {
+            name: {
+                "games": games,
+                "wins": wins,
+                "win_rate": (wins / games if games else 0.0, *wilson_interval(wins, games)),
+                "shots_to_win": mean_interval(shots, squares, wins),
+            }
+            for name, (games, wins, shots, squares) in table.items()
+        }
+
+    def results(self):
+        games = sum(m.games for m in self.matchups.values())
+        return {
+            "games": games,
+            "elapsed": self.elapsed,
+            "games_per_sec": games / self.elapsed if self.elapsed else 0.0,
+            "workers": self.workers,
+            "seed": self.seed,
+            "budgets": self.budgets,
+            "matchups": [m.as_dict() for m in self.matchups.values()],
+            "standings": {size: self.standings(size) for size in self.presets},
+        }
+
+
+def _fmt_interval(value):
+    if value is None:
+        return "-"
+    mean, low, high = value
+    return f"{mean:.2f} [{low:.2f}, {high:.2f}]"
+
+
+def report(results, presets):
+    lines = [
+        f"{results['games']} games on {results['workers']} workers in {results['elapsed']:.2f} s, "
+        f"{results['games_per_sec']:.1f} games/s, seed {results['seed']}"
+    ]
+    for size, standings in results["standings"].items():
+        lines.append(f"{size}x{size} {presets[size]}")
+        lines.append(f"  {'strategy':<12} {'games':>8} {'win rate, 95% CI':>26} {'shots to win, 95% CI':>26}")
+        ranked = sorted(standings.items(), key=lambda item: -item[1]["win_rate"][0])
+        for name, row in ranked:
+            rate, low, high = row["win_rate"]
+            win_rate = f"{rate:.3f} [{low:.3f}, {high:.3f}]"
+            lines.append(
+                f"  {name:<12} {row['games']:>8} {win_rate:>26} {_fmt_interval(row['shots_to_win']):>26}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from .game import SHIPS_PRESETS
+
+    parser = argparse.ArgumentParser(description="Play seeded AI tournaments across all cores.")
+    parser.add_argument("strategies", nargs="+", help="strategy names or tiers")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="games per pairing and size")
+    parser.add_argument("--mode", choices=("round-robin", "head-to-head"), default="round-robin")
+    parser.add_argument("--sizes", type=int, nargs="+", choices=sorted(SHIPS_PRESETS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--batch", type=int, default=BATCH_GAMES)
+    parser.add_argument(
+        "--budgets", action="store_true", help="cut each move at its strategy's time budget (not reproducible)"
+    )
+    args = parser.parse_args(argv)
+    presets = {size: SHIPS_PRESETS[size] for size in (args.sizes or SHIPS_PRESETS)}
+    with Tournament(
+        args.strategies,
+        presets,
+        games=args.games,
+        mode=args.mode,
+        seed=args.seed,
+        workers=args.workers,
+        batch=args.batch,
+        budgets=args.budgets,
+    ) as tournament:
+        results = tournament.run()
+    print(report(results, tournament.presets))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,20 @@ import time
 import tkinter as tk
 from tkinter import messagebox
 
-from .core import Board, Dot, Ship, BoardException, BoardWrongShipException
+from .core import (
+    Board,
+    Dot,
+    Ship,
+    BoardException,
+    BoardWrongShipException,
+    MISS,
+    HIT,
+    SUNK,
+    SHOT_MESSAGES,
+)
 from .game import GameConfig, create_game, ships_config_for_size
+from .placement import cells_mask, placement_table
+from .pool import BoardPool
 
 
 class TkUI:
@@ -25,6 +37,13 @@ class TkUI:
         self.mode = "pve"
         self.size = 6
         self.ships_config = ships_config_for_size(self.size)
+        self.ai_tier = "normal"
+        self.tier_labels = {
+            "easy": "Лёгкая",
+            "normal": "Обычная",
+            "hard": "Сложная",
+            "expert": "Эксперт",
+        }
 
         self.placement_board = None
         self.placement_player_index = 0
@@ -49,6 +68,7 @@ class TkUI:
 
         self.p1_board = None
         self.p2_board = None
+        self.board_pool = BoardPool(capacity=2)
         self.game = None
         self.game_over = False
         self.locked = False
@@ -73,6 +93,11 @@ class TkUI:
         self.STATUS_MISS = "MISS"
         self.STATUS_HIT = "HIT"
         self.STATUS_KILL = "KILL"
+        self.shot_statuses = {
+            MISS: (self.STATUS_MISS, "мимо"),
+            HIT: (self.STATUS_HIT, "попадание"),
+            SUNK: (self.STATUS_KILL, "уничтожен"),
+        }
 
         self._register_traces()
 
@@ -153,6 +178,8 @@ class TkUI:
 
         self.p1_board = None
         self.p2_board = None
+        if self.game is not None:
+            self.game.close()
         self.game = None
         self.game_over = False
         self.locked = False
@@ -177,6 +204,11 @@ class TkUI:
         self.STATUS_MISS = "MISS"
         self.STATUS_HIT = "HIT"
         self.STATUS_KILL = "KILL"
+        self.shot_statuses = {
+            MISS: (self.STATUS_MISS, "мимо"),
+            HIT: (self.STATUS_HIT, "попадание"),
+            SUNK: (self.STATUS_KILL, "уничтожен"),
+        }
 
         if mode == "to_menu":
             self.mode = "pve"
@@ -200,7 +232,12 @@ class TkUI:
 
     def run(self):
         self.show_menu()
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            if self.game is not None:
+                self.game.close()
+            self.board_pool.cancel()
 
     def show_menu(self):
         self._show_screen("menu")
@@ -225,10 +262,19 @@ class TkUI:
         tk.Radiobutton(self.menu_frame, text="Игрок vs AI", value="pve", variable=mode_var).pack(anchor="w")
         tk.Radiobutton(self.menu_frame, text="Игрок vs Игрок", value="pvp", variable=mode_var).pack(anchor="w")
 
+        tk.Label(self.menu_frame, text="Сложность AI:").pack(anchor="w", pady=(10, 0))
+        tier_var = tk.StringVar(value=self.ai_tier)
+        for tier, label in self.tier_labels.items():
+            tk.Radiobutton(self.menu_frame, text=label, value=tier, variable=tier_var).pack(anchor="w")
+
         def on_start():
             self.size = size_var.get()
             self.ships_config = ships_config_for_size(self.size)
             self.mode = mode_var.get()
+            self.ai_tier = tier_var.get()
+            if self.mode == "pve":
+                # The AI board is generated in the background while the player places ships.
+                self.board_pool.prefill(self.size, self.ships_config)
             self.start_placement(player_index=0)
 
         tk.Button(self.menu_frame, text="Начать", command=on_start).pack(pady=10)
@@ -464,20 +510,8 @@ class TkUI:
     def _now_time(self):
         return time.strftime("%H:%M:%S")
 
-    def _normalize_shot(self, message, repeat):
-        lower = message.lower()
-        if "убил" in lower or "потоп" in lower or "потопил" in lower or "уничтожен" in lower:
-            status = self.STATUS_KILL
-            short = "уничтожен"
-        elif "попал" in lower or "ранен" in lower:
-            status = self.STATUS_HIT
-            short = "попадание"
-        elif "мимо" in lower:
-            status = self.STATUS_MISS
-            short = "мимо"
-        else:
-            status = self.STATUS_MISS
-            short = message.strip()[:40] if message else "мимо"
+    def _normalize_shot(self, result, repeat):
+        status, short = self.shot_statuses[result.code]
         if repeat:
             short += " (повтор)"
         return status, short
@@ -534,7 +568,7 @@ class TkUI:
         self._series_actor = None
         self._series_count = 0
 
-    def _log_event(self, kind, actor=None, dot=None, message=None, repeat=False):
+    def _log_event(self, kind, actor=None, dot=None, message=None, repeat=False, result=None):
         if kind == "start":
             line = f"=== Старт игры: режим {actor}, поле {self.size}x{self.size} ==="
             self._log_with_tag(line, "header")
@@ -561,7 +595,7 @@ class TkUI:
 
         self.turn_counter += 1
         coord = self._fmt_coord(dot) if dot else "?"
-        status, result_text = self._normalize_shot(message or "", repeat)
+        status, result_text = self._normalize_shot(result, repeat)
         tag = status.lower()
         line = f"[{self._now_time()}] #{self.turn_counter} [{status}] {actor}: {coord} — {result_text}"
         self._log_with_tag(line, tag)
@@ -592,7 +626,7 @@ class TkUI:
 
     def _validate_preview(self, dots):
         for d in dots:
-            if self.placement_board.out(d) or d in self.placement_board.busy:
+            if self.placement_board.out(d) or d in self.placement_board.occupied:
                 return False
         return True
 
@@ -600,14 +634,9 @@ class TkUI:
         length = self.selected_length.get()
         if length <= 0:
             return set()
-        orientation = self.orientation_var.get()
-        starts = set()
-        for x in range(self.size):
-            for y in range(self.size):
-                dots = self._calc_dots((x, y), length, orientation)
-                if self._validate_preview(dots):
-                    starts.add((x, y))
-        return starts
+        table = placement_table(self.size, length, self._ship_orientation_flag())
+        occupied = cells_mask(self.placement_board.occupied, self.size)
+        return {(table.xs[i], table.ys[i]) for i in table.open(occupied)}
 
     def _ship_cells(self):
         cells = set()
@@ -787,7 +816,12 @@ class TkUI:
         self.show_menu()
 
     def start_game(self):
-        config = GameConfig(size=self.size, ships_config=self.ships_config, mode=self.mode)
+        config = GameConfig(
+            size=self.size,
+            ships_config=self.ships_config,
+            mode=self.mode,
+            ai_strategy=self.ai_tier,
+        )
         if self.mode == "pvp":
             self.game = create_game(
                 config,
@@ -802,6 +836,7 @@ class TkUI:
                 p1_board=self.p1_board,
                 ai_board=None,
                 human_name="Игрок",
+                board_pool=self.board_pool,
             )
         self.game_over = False
         self.locked = False
@@ -933,6 +968,7 @@ class TkUI:
 
         self.turn_label.config(text=f"Ход: {current_name}")
 
+        grid = Dot.grid(self.size)
         for x in range(self.size):
             for y in range(self.size):
                 left_btn = self.game_buttons[("left", x, y)]
@@ -944,7 +980,7 @@ class TkUI:
                     cell = "O"
                 right_btn.config(text=cell)
 
-                if Dot(x, y) in right_board.busy or self.game_over or self.locked or self.input_locked:
+                if grid[x][y] in right_board.shots or self.game_over or self.locked or self.input_locked:
                     right_btn.config(state="disabled")
                 else:
                     right_btn.config(state="normal")
@@ -963,13 +999,14 @@ class TkUI:
             shooter_name = "Игрок"
 
         try:
-            repeat, message = target_board.shot(Dot(x, y))
+            result = target_board.fire(Dot(x, y))
         except BoardException as e:
             self.say(str(e))
             return
 
-        self.say(message)
-        self._log_event("shot", actor=shooter_name, dot=Dot(x, y), message=message, repeat=repeat)
+        repeat = result.repeat
+        self.say(SHOT_MESSAGES[result.code])
+        self._log_event("shot", actor=shooter_name, dot=result.dot, repeat=repeat, result=result)
         self.refresh_game()
 
         if self.game.is_winner(target_board):
@@ -999,14 +1036,13 @@ class TkUI:
     def _do_ai_turn(self):
         self._ai_after_id = None
         board = self.game.us.board
-        before_len = len(board.busy)
-        repeat = self.game.ai.move()
+        before_len = len(board.shots)
+        repeat = self.game.ai_move()
         self.refresh_game()
 
-        result_message = self.status_var.get()
-        if len(board.busy) > before_len:
-            shot_dot = board.busy[before_len]
-            self._log_event("shot", actor="Компьютер", dot=shot_dot, message=result_message, repeat=repeat)
+        if len(board.shots) > before_len:
+            result = self.game.ai.last_result
+            self._log_event("shot", actor="Компьютер", dot=result.dot, repeat=repeat, result=result)
 
         if self.game.is_winner(self.game.us.board):
             self.finish_game("Компьютер")
@@ -1033,6 +1069,7 @@ class TkUI:
         self.turn_status_var.set("")
         self.refresh_game()
         self._log_event("win", actor=winner)
+        self.game.close()
         messagebox.showinfo("Игра окончена", f"{winner} выиграл!")
         self._cancel_after_jobs()
         self.show_end_screen(winner)
@@ -0,0 +1,67 @@
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.bitboard import BitBoard
+from battleship.core import Board, Dot, Ship
+
+SIZES = (10, 50, 200)
+MAX_SHOTS = 1000
+
+
+def fleet_layout(size):
+    # Length-4 ships every other row, five columns apart, capped at `size` ships.
+    ships = []
+    for x in range(0, size, 2):
+        for y in range(0, size - 3, 5):
+            ships.append((x, y))
+            if len(ships) >= size:
+                return ships
+    return ships
+
+
+def build(board_cls, size):
+    board = board_cls(size=size)
+    for x, y in fleet_layout(size):
+        board.add_ship(Ship(Dot(x, y), 4, 1))
+    board.begin()
+    # The open-cell pool is built lazily on first use; keep that one-off
+    # pass out of the timed shots.
+    board.unshot
+    return board
+
+
+def shots_for(size, seed=0):
+    cells = [Dot(x, y) for x in range(size) for y in range(size)]
+    random.Random(seed).shuffle(cells)
+    return cells[:MAX_SHOTS]
+
+
+def run(board_cls, size):
+    cells = shots_for(size)
+    start = time.perf_counter()
+    board = build(board_cls, size)
+    placed = time.perf_counter()
+    shots = 0
+    for d in cells:
+        if d in board.shots:
+            continue
+        board.shot(d)
+        shots += 1
+    done = time.perf_counter()
+    return placed - start, (done - placed) / max(shots, 1), shots
+
+
+def main():
+    print(f"{'size':>5} {'engine':>8} {'place, ms':>10} {'shot, us':>10} {'shots':>6}")
+    for size in SIZES:
+        for board_cls in (Board, BitBoard):
+            place, shot, shots = run(board_cls, size)
+            print(f"{size:>5} {board_cls.__name__:>8} {place * 1e3:>10.2f} {shot * 1e6:>10.2f} {shots:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.heatmap import density_map, np
+
+SIZES = (10, 50, 200)
+FLEET = [5, 4, 4, 3, 3, 3, 2, 2, 2, 2, 1, 1, 1, 1]
+REPEAT = 10
+
+
+def timed(size, blocked, use_numpy):
+    density_map(size, FLEET, blocked, use_numpy=use_numpy)
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        density_map(size, FLEET, blocked, use_numpy=use_numpy)
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'size':>6} {'python, ms':>11} {'numpy, ms':>10}")
+    for size in SIZES:
+        blocked = [bytearray(rng.random() < 0.3 for _ in range(size)) for _ in range(size)]
+        python = timed(size, blocked, False)
+        if np is None:
+            print(f"{size:>6} {python * 1e3:>11.2f} {'n/a':>10}")
+            continue
+        fast = timed(size, np.array(blocked, dtype=bool), True)
+        print(f"{size:>6} {python * 1e3:>11.2f} {fast * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
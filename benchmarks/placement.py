@@ -0,0 +1,74 @@
+import sys
+import time
+from pathlib import Path
+from random import randint
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.core import Board, Dot, Ship, BoardWrongShipException
+from battleship.game import SHIPS_PRESETS
+from battleship.placement import place_fleet
+
+CASES = [
+    (6, SHIPS_PRESETS[6]),
+    (8, SHIPS_PRESETS[8]),
+    (10, SHIPS_PRESETS[10]),
+    (10, [4, 4, 3, 3, 3, 2, 2, 2, 2, 1, 1, 1]),
+    (20, [5, 5, 4, 4, 4, 3, 3, 3, 3, 3, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1]),
+]
+DURATION = 1.0
+
+
+def rejection_place(size, ships_config):
+    # Game.random_place before the constructive placer, kept for comparison.
+    board = Board(size=size)
+    attempts = 0
+    for l in ships_config:
+        while True:
+            attempts += 1
+            if attempts > 2000:
+                return None
+            ship = Ship(Dot(randint(0, size), randint(0, size)), l, randint(0, 1))
+            try:
+                board.add_ship(ship)
+                break
+            except BoardWrongShipException:
+                pass
+    board.begin()
+    return board
+
+
+def rejection_board(size, ships_config):
+    board = None
+    while board is None:
+        board = rejection_place(size, ships_config)
+    return board
+
+
+def constructive_board(size, ships_config):
+    board = None
+    while board is None:
+        board = place_fleet(size, ships_config)
+    board.begin()
+    return board
+
+
+def rate(func, size, ships_config):
+    boards = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        func(size, ships_config)
+        boards += 1
+    return boards / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'size':>5} {'ships':>6} {'rejection/s':>12} {'constructive/s':>15}")
+    for size, ships_config in CASES:
+        old = rate(rejection_board, size, ships_config)
+        new = rate(constructive_board, size, ships_config)
+        print(f"{size:>5} {len(ships_config):>6} {old:>12.1f} {new:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
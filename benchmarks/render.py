@@ -0,0 +1,55 @@
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.arrayboard import ArrayBoard
+from battleship.core import Board
+from benchmarks.bitboard import build
+
+SIZE = 100
+SHOTS = 3000
+REPEAT = 20
+
+
+def prepared(board_cls, **kwargs):
+    board = build(lambda size: board_cls(size=size, **kwargs), SIZE)
+    cells = [d for row in board.grid for d in row]
+    random.Random(0).shuffle(cells)
+    for d in cells[:SHOTS]:
+        if d not in board.shots:
+            board.fire(d)
+    return board
+
+
+def timed(board):
+    str(board)
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        str(board)
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    engines = [
+        ("Board", prepared(Board)),
+        ("python", prepared(ArrayBoard, use_numpy=False)),
+        ("numpy", prepared(ArrayBoard)),
+    ]
+    print(f"{SIZE}x{SIZE}, {SHOTS} shots")
+    print(f"{'engine':>8} {'open, ms':>10} {'hidden, ms':>11}")
+    for name, board in engines:
+        if name == "numpy" and not board.numpy:
+            print(f"{name:>8} {'n/a':>10} {'n/a':>11}")
+            continue
+        board.hid = False
+        shown = timed(board)
+        board.hid = True
+        hidden = timed(board)
+        print(f"{name:>8} {shown * 1e3:>10.2f} {hidden * 1e3:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
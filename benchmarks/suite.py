@@ -0,0 +1,275 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.core import Board, Ship
+from battleship.game import Game, SHIPS_PRESETS
+from battleship.generator import generate_board
+from battleship.heatmap import np
+from battleship.placement import cells_mask, placement_table
+from battleship.players import AI
+from battleship.sim import play_game
+
+SIZES = (6, 10, 30, 100)
+WARMUP = 2
+REPEAT = 10
+SEED = 0
+
+
+def fleet_for(size):
+    # Presets where they exist; bigger boards get copies of the 10x10 fleet
+    # at half its density, which still places in well under a second.
+    if size in SHIPS_PRESETS:
+        return list(SHIPS_PRESETS[size])
+    return SHIPS_PRESETS[10] * max(1, (size // 10) ** 2 // 2)
+
+
+def fresh_board(size, index=0):
+    board = generate_board(size, fleet_for(size), SEED, index)
+    # Build the lazy open-cell pool outside the timed region.
+    board.unshot
+    return board
+
+
+def shuffled_cells(board, index=0):
+    cells = [d for row in board.grid for d in row]
+    random.Random(index).shuffle(cells)
+    return cells
+
+
+# Every case is setup(size, rep) -> state, untimed, and run(state) -> the
+# number of operations timed, so results come out per operation.
+
+def setup_shot(size, rep):
+    board = fresh_board(size, rep)
+    return board, shuffled_cells(board, rep)
+
+
+def run_shot(state):
+    board, cells = state
+    shots = 0
+    for d in cells:
+        if d not in board.shots:
+            board.shot(d)
+            shots += 1
+    return shots
+
+
+def setup_add_ship(size, rep):
+    layout = fresh_board(size, rep).ships
+    return Board(size=size), [(ship.bow, ship.l, ship.o) for ship in layout]
+
+
+def run_add_ship(state):
+    board, layout = state
+    for bow, l, o in layout:
+        board.add_ship(Ship(bow, l, o))
+    return len(layout)
+
+
+def setup_contour(size, rep):
+    # Every ship is hit on all but its last cell, so each timed shot sinks
+    # a ship and reveals its halo.
+    board = fresh_board(size, rep)
+    last = []
+    for ship in board.ships:
+        *hits, end = ship.dots
+        for d in hits:
+            board.fire(d)
+        last.append(end)
+    return board, last
+
+
+def run_contour(state):
+    # The sink path: fire() on the last live cell and contour(verb=True).
+    board, last = state
+    for d in last:
+        board.fire(d)
+    return len(last)
+
+
+def setup_str(size, rep):
+    board = fresh_board(size, rep)
+    cells = shuffled_cells(board, rep)
+    for d in cells[:len(cells) // 2]:
+        if d not in board.shots:
+            board.fire(d)
+    board.hid = True
+    return board
+
+
+def run_str(board):
+    str(board)
+    return 1
+
+
+def setup_random_place(size, rep):
+    game = Game.__new__(Game)
+    game.size = size
+    game.ships_config = fleet_for(size)
+    random.seed(rep)
+    return game
+
+
+def run_random_place(game):
+    game.random_place()
+    return 1
+
+
+def setup_ai(size, rep):
+    # The AI builds its hunt index when created, outside the timed region.
+    random.seed(rep)
+    return AI(fresh_board(size, 2 * rep), fresh_board(size, 2 * rep + 1), None)
+
+
+def run_ai_ask(ai):
+    # Hunt-mode picks on an untouched board; ask() alone fires nothing.
+    for _ in range(100):
+        ai.ask()
+    return 100
+
+
+def run_ai_move(ai):
+    # Hunt and target moves until the whole fleet is sunk.
+    enemy = ai.enemy
+    moves = 0
+    while enemy.count < len(enemy.ships):
+        ai.move()
+        moves += 1
+    return moves
+
+
+def setup_valid_starts(size, rep):
+    # The placement screen halfway through a fleet, as TkUI sees it.
+    board = fresh_board(size, rep)
+    placing = Board(size=size)
+    for ship in board.ships[:len(board.ships) // 2]:
+        placing.add_ship(Ship(ship.bow, ship.l, ship.o))
+    return placing, sorted(set(fleet_for(size)), reverse=True)
+
+
+def run_valid_starts(state):
+    # TkUI._compute_valid_starts for every length and orientation.
+    placing, lengths = state
+    size = placing.size
+    occupied = cells_mask(placing.occupied, size)
+    for length in lengths:
+        for o in (0, 1):
+            table = placement_table(size, length, o)
+            {(table.xs[i], table.ys[i]) for i in table.open(occupied)}
+    return 2 * len(lengths)
+
+
+def setup_game(size, rep):
+    return size, rep
+
+
+def run_game(state):
+    size, rep = state
+    play_game(size, fleet_for(size), ("hunt", "hunt"), SEED, rep)
+    return 1
+
+
+CASES = {
+    "board.shot": (setup_shot, run_shot),
+    "board.add_ship": (setup_add_ship, run_add_ship),
+    "board.contour": (setup_contour, run_contour),
+    "board.str": (setup_str, run_str),
+    "game.random_place": (setup_random_place, run_random_place),
+    "ai.ask": (setup_ai, run_ai_ask),
+    "ai.move": (setup_ai, run_ai_move),
+    "placement.valid_starts": (setup_valid_starts, run_valid_starts),
+    "sim.game": (setup_game, run_game),
+}
+
+
+def percentile_stats(samples):
+    ordered = sorted(samples)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+    else:
+        cuts = ordered * 99
+    return {
+        "mean": statistics.fmean(ordered),
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "min": ordered[0],
+        "p50": cuts[49],
+        "p90": cuts[89],
+        "p99": cuts[98],
+        "max": ordered[-1],
+    }
+
+
+def bench(name, size, warmup=WARMUP, repeat=REPEAT):
+    setup, run = CASES[name]
+    per_op = []
+    ops = 0
+    for rep in range(warmup + repeat):
+        state = setup(size, rep)
+        start = time.perf_counter()
+        count = run(state)
+        elapsed = time.perf_counter() - start
+        if rep >= warmup:
+            ops += count
+            per_op.append(elapsed / count * 1e6)
+    return {
+        "case": name,
+        "size": size,
+        "ships": len(fleet_for(size)),
+        "warmup": warmup,
+        "repeat": repeat,
+        "ops": ops,
+        "unit": "us/op",
+        **percentile_stats(per_op),
+    }
+
+
+def run_suite(cases=None, sizes=SIZES, warmup=WARMUP, repeat=REPEAT, progress=None):
+    results = []
+    for name in cases or CASES:
+        for size in sizes:
+            if progress is not None:
+                progress(name, size)
+            results.append(bench(name, size, warmup, repeat))
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "numpy": np is not None,
+        "seed": SEED,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the engine hot paths and print the results as JSON.")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--warmup", type=int, default=WARMUP)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--out", help="write the JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    def progress(name, size):
+        print(f"{name} {size}x{size}", file=sys.stderr)
+
+    report = run_suite(args.cases, args.sizes, args.warmup, args.repeat, progress)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
-from battleship.game import Game
+from battleship.game import SHIPS_PRESETS, Game
+from battleship.pool import BoardPool
 from battleship.ui_console import ConsoleUI
 
 
 def main():
     ui = ConsoleUI()
-    mode = ui.choose_game_mode()
-    size, ships_config = ui.choose_game_settings()
-    game = Game(size=size, ships_config=ships_config, ui=ui, mode=mode)
-    game.start()
+    with BoardPool(capacity=2) as pool:
+        # Boards for every preset build while the player picks the settings.
+        for size, ships_config in SHIPS_PRESETS.items():
+            pool.prefill(size, ships_config)
+        mode = ui.choose_game_mode()
+        size, ships_config = ui.choose_game_settings()
+        pool.prefill(size, ships_config)
+        game = Game(size=size, ships_config=ships_config, ui=ui, mode=mode, board_pool=pool)
+        game.start()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import sys
+from collections import Counter
 from pathlib import Path
 import unittest
 
@@ -54,6 +55,80 @@ class AIStrategyTests(unittest.TestCase):
         self.assertEqual(next_target.x, 2)
         self.assertEqual(next_target.y, 2)
 
+    def test_open_cell_index_follows_shots_and_halo(self):
+        enemy = build_enemy_board((0, 0), length=2, orientation=0)
+        ai = AI(Board(size=6), enemy, DummyUI(), choice_func=prefer_dot(Dot(0, 0)))
+        ai.move()
+        ai.move()  # sinks the ship and reveals its halo
+
+        available = ai._available_dots()
+        self.assertEqual(set(available), set(enemy.unshot))
+        self.assertEqual(len(available), 36 - len(enemy.shots))
+        self.assertTrue(all((d.x + d.y) % 2 == 0 for d in ai._hunt_candidates()))
+
+    def test_hunts_odd_cells_once_even_cells_are_closed(self):
+        enemy = Board(size=4)
+        enemy.begin()
+        ai = AI(Board(size=4), enemy, DummyUI())
+        for _ in range(8):
+            ai.move()
+        self.assertTrue(all((d.x + d.y) % 2 == 0 for d in enemy.shots))
+        self.assertTrue(all((d.x + d.y) % 2 == 1 for d in ai._hunt_candidates()))
+
+    def test_skips_cells_closed_by_someone_else(self):
+        enemy = Board(size=2)
+        enemy.begin()
+        ai = AI(Board(size=2), enemy, DummyUI())
+        ai._available_dots()
+        enemy.fire(Dot(0, 0))
+        enemy.fire(Dot(1, 1))
+        d = ai.ask()
+        self.assertEqual((d.x + d.y) % 2, 1)
+
+    def test_hunts_on_the_lattice_of_the_shortest_ship(self):
+        enemy = build_enemy_board((0, 0), length=3, orientation=0)
+        ai = AI(Board(size=6), enemy, DummyUI(), choice_func=prefer_dot(Dot(4, 4)), ships_config=[3, 3])
+        self.assertEqual(ai._lattice_step(), 3)
+        # All three classes are tied on an untouched board.
+        self.assertEqual(len(ai._hunt_candidates()), 36)
+
+        ai.move()  # miss at (4, 4), class 2
+        candidates = ai._hunt_candidates()
+        self.assertEqual(len(candidates), 11)
+        self.assertTrue(all((d.x + d.y) % 3 == 2 for d in candidates))
+
+    def test_falls_back_to_any_open_cell_when_the_lattice_is_empty(self):
+        enemy = build_enemy_board((0, 0), length=3, orientation=0)
+        ai = AI(Board(size=6), enemy, DummyUI())
+        for pool in ai._lattice_pools(ai._lattice_step()):
+            for d in list(pool):
+                pool.discard(d)
+        self.assertEqual(ai._hunt_candidates(), [])
+        self.assertIn(ai.ask(), set(enemy.unshot))
+
+    def test_single_cell_ships_keep_the_longer_lattice(self):
+        enemy = build_enemy_board((0, 0), length=3, orientation=0)
+        ai = AI(Board(size=6), enemy, DummyUI(), ships_config=[3, 1, 1])
+        self.assertEqual(ai._lattice_step(), 3)
+        ai.afloat[3] = 0
+        self.assertEqual(ai._lattice_step(), 1)
+
+    def test_switches_lattice_when_the_shortest_ship_sinks(self):
+        enemy = build_enemy_board((0, 0), length=2, orientation=0)
+        ai = AI(Board(size=6), enemy, DummyUI(), choice_func=prefer_dot(Dot(0, 0)), ships_config=[3, 2])
+        self.assertEqual(ai._lattice_step(), 2)
+        ai.move()
+        ai.move()  # sinks the two-deck ship
+        self.assertEqual(ai.mode, "hunt")
+        self.assertEqual(ai._lattice_step(), 3)
+
+        candidates = ai._hunt_candidates()
+        self.assertTrue(candidates)
+        self.assertFalse(set(candidates) & set(enemy.shots))
+        open_per_class = Counter((d.x + d.y) % 3 for d in enemy.unshot)
+        fewest = min(open_per_class.values())
+        self.assertTrue(all(open_per_class[(d.x + d.y) % 3] == fewest for d in candidates))
+
 
 if __name__ == "__main__":
     unittest.main()
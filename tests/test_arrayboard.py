@@ -0,0 +1,76 @@
+import random
+import sys
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship import arrayboard
+from battleship.arrayboard import ArrayBoard, CELL_HIT, CELL_HALO
+from battleship.core import Dot, Ship, Board
+
+
+def play(board_cls, size=12, shots=60, **kwargs):
+    board = board_cls(size=size, **kwargs)
+    board.add_ship(Ship(Dot(0, 0), 3, 1))
+    board.add_ship(Ship(Dot(2, 0), 2, 0))
+    board.add_ship(Ship(Dot(11, 11), 1, 0))
+    board.begin()
+    cells = [Dot(x, y) for x in range(size) for y in range(size)]
+    random.Random(5).shuffle(cells)
+    for d in cells[:shots] + [Dot(0, 0), Dot(0, 1), Dot(0, 2)]:
+        if d not in board.shots:
+            board.fire(d)
+    return board
+
+
+class ArrayBoardTests(unittest.TestCase):
+    def check_render(self, use_numpy):
+        board = play(Board)
+        array = play(ArrayBoard, use_numpy=use_numpy)
+        self.assertEqual(array.numpy, use_numpy)
+        self.assertEqual(array.field, board.field)
+        self.assertEqual(str(array), str(board))
+        board.hid = array.hid = True
+        self.assertEqual(str(array), str(board))
+
+    def test_python_render_matches_board(self):
+        self.check_render(use_numpy=False)
+
+    @unittest.skipIf(arrayboard.np is None, "NumPy is not installed")
+    def test_numpy_render_matches_board(self):
+        self.check_render(use_numpy=True)
+
+    def test_masks_follow_shots(self):
+        for use_numpy in (False, True):
+            if use_numpy and arrayboard.np is None:
+                continue
+            board = play(ArrayBoard, shots=0, use_numpy=use_numpy)
+            self.assertTrue(board.hit_mask[0][1])
+            self.assertTrue(board.halo_mask[1][1])
+            self.assertEqual(board.codes[0][2], CELL_HIT)
+            self.assertEqual(board.codes[1][3], CELL_HALO)
+
+    def test_restore_rebuilds_codes(self):
+        board = play(ArrayBoard, shots=0)
+        clone = ArrayBoard.from_snapshot(board.snapshot())
+        self.assertEqual(str(clone), str(board))
+        self.assertEqual(clone.codes[0][2], CELL_HIT)
+
+    def test_restore_keeps_halo(self):
+        for use_numpy in (False, True):
+            if use_numpy and arrayboard.np is None:
+                continue
+            board = play(ArrayBoard, shots=0, use_numpy=use_numpy)
+            clone = ArrayBoard(use_numpy=use_numpy).restore(board.snapshot())
+            self.assertEqual(clone.codes[1][3], CELL_HALO)
+            if use_numpy:
+                self.assertTrue((clone.halo_mask == board.halo_mask).all())
+                self.assertTrue((clone.miss_mask == board.miss_mask).all())
+            else:
+                self.assertEqual(clone.halo_mask, board.halo_mask)
+                self.assertEqual(clone.miss_mask, board.miss_mask)
+
+
+if __name__ == "__main__":
+    unittest.main()
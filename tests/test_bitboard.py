@@ -0,0 +1,118 @@
+import random
+import sys
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.bitboard import BitBoard
+from battleship.game import Game
+from battleship.core import (
+    Dot,
+    Ship,
+    Board,
+    BoardOutException,
+    BoardUsedException,
+    BoardWrongShipException,
+)
+
+
+def place(board_cls, size=6):
+    board = board_cls(size=size)
+    board.add_ship(Ship(Dot(0, 0), 3, 1))
+    board.add_ship(Ship(Dot(2, 0), 2, 0))
+    board.add_ship(Ship(Dot(5, 5), 1, 0))
+    board.begin()
+    return board
+
+
+class BitBoardTests(unittest.TestCase):
+    def test_matches_list_board_shot_by_shot(self):
+        cells = [Dot(x, y) for x in range(6) for y in range(6)]
+        random.Random(3).shuffle(cells)
+        board = place(Board)
+        bits = place(BitBoard)
+
+        for d in cells:
+            self.assertEqual(d in board.busy, d in bits.busy)
+            if d in board.busy:
+                continue
+            self.assertEqual(board.shot(d), bits.shot(d))
+            self.assertEqual(board.field, bits.field)
+            self.assertEqual(board.count, bits.count)
+        self.assertEqual(set(board.busy), set(bits.busy))
+        self.assertEqual(str(board), str(bits))
+
+    def test_exceptions_match_board(self):
+        board = place(BitBoard)
+        with self.assertRaises(BoardOutException):
+            board.shot(Dot(6, 0))
+        board.shot(Dot(0, 0))
+        with self.assertRaises(BoardUsedException):
+            board.shot(Dot(0, 0))
+
+    def test_add_ship_rejects_out_of_bounds_and_adjacent(self):
+        board = BitBoard(size=6)
+        with self.assertRaises(BoardWrongShipException):
+            board.add_ship(Ship(Dot(0, 5), 2, 1))
+
+        board.add_ship(Ship(Dot(0, 0), 2, 1))
+        with self.assertRaises(BoardWrongShipException):
+            board.add_ship(Ship(Dot(1, 2), 1, 0))
+
+    def test_spread_does_not_wrap_rows(self):
+        board = BitBoard(size=4)
+        halo = board.spread(board.bit(Dot(1, 3)))
+        self.assertEqual(
+            sorted((d.x, d.y) for d in board.dots_of(halo)),
+            [(0, 2), (0, 3), (1, 2), (1, 3), (2, 2), (2, 3)],
+        )
+
+    def test_game_can_switch_board_engine(self):
+        class BitGame(Game):
+            board_cls = BitBoard
+
+        game = BitGame.__new__(BitGame)
+        game.size = 10
+        game.ships_config = [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
+        board = game.random_board()
+        self.assertIsInstance(board, BitBoard)
+        self.assertEqual(len(board.ships), 10)
+
+    def test_masks_follow_shots(self):
+        board = place(Board)
+        bits = place(BitBoard)
+        for d in (Dot(4, 4), Dot(0, 0), Dot(5, 5), Dot(2, 0)):
+            board.fire(d)
+            bits.fire(d)
+            self.assertEqual(bits.closed_mask, bits.mask_of(board.shots))
+            self.assertEqual(bits.halo_mask, bits.mask_of(board.halo))
+            self.assertEqual(bits.shot_mask, bits.mask_of(board.shots) & ~bits.mask_of(board.halo))
+            self.assertEqual(bits.hit_mask, bits.mask_of(d for d in board.shots if board.field[d.x][d.y] == "X"))
+            self.assertEqual(len(bits.shots), len(board.shots))
+            self.assertEqual(set(bits.shots), set(board.shots))
+
+    def test_snapshot_is_shared_with_board(self):
+        cells = [Dot(x, y) for x in range(6) for y in range(6)]
+        random.Random(7).shuffle(cells)
+        board = place(Board)
+        bits = place(BitBoard)
+        for d in cells[:20] + [Dot(0, 0), Dot(0, 1), Dot(0, 2)]:
+            if d not in board.shots:
+                board.fire(d)
+                bits.fire(d)
+        self.assertEqual(bits.snapshot(), board.snapshot())
+
+        clone = BitBoard.from_snapshot(board.snapshot())
+        for name in ("occupied_mask", "closed_mask", "ship_mask", "shot_mask", "hit_mask", "halo_mask"):
+            self.assertEqual(getattr(clone, name), getattr(bits, name), name)
+        self.assertEqual(clone.field, bits.field)
+        self.assertEqual(clone.count, bits.count)
+        self.assertEqual(set(clone.unshot), set(bits.unshot))
+        for d in cells:
+            if d not in bits.shots:
+                self.assertEqual(clone.shot(d), bits.shot(d))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import pickle
 import sys
 from pathlib import Path
 import unittest
@@ -5,11 +6,15 @@ import unittest
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from battleship.core import (
+    CellPool,
     Dot,
     Ship,
     Board,
     BoardWrongShipException,
     BoardUsedException,
+    MISS,
+    HIT,
+    SUNK,
 )
 
 
@@ -57,6 +62,21 @@ class BoardLogicTests(unittest.TestCase):
         self.assertIn(Dot(0, 0), board.busy)
         self.assertEqual(board.field[0][0], ".")
 
+    def test_fire_returns_typed_results(self):
+        board, ship = build_board_with_ship((1, 1), length=2, orientation=1)
+
+        self.assertEqual(board.fire(Dot(4, 4)).code, MISS)
+        hit = board.fire(Dot(1, 1))
+        self.assertEqual((hit.code, hit.ship, hit.repeat), (HIT, ship, True))
+
+        sunk = board.fire(Dot(1, 2))
+        self.assertEqual(sunk.code, SUNK)
+        self.assertIs(sunk.ship, ship)
+        self.assertFalse(sunk.repeat)
+        self.assertEqual(len(sunk.halo), 10)
+        self.assertIn(Dot(0, 0), sunk.halo)
+        self.assertNotIn(Dot(1, 1), sunk.halo)
+
     def test_add_ship_rejects_out_of_bounds_and_adjacent(self):
         board = Board(size=6)
         with self.assertRaises(BoardWrongShipException):
@@ -66,6 +86,118 @@ class BoardLogicTests(unittest.TestCase):
         with self.assertRaises(BoardWrongShipException):
             board.add_ship(Ship(Dot(1, 1), 1, 0))
 
+    def test_ship_cells_are_computed_once(self):
+        ship = Ship(Dot(1, 2), 3, 1)
+        self.assertIs(ship.dots, ship.dots)
+        self.assertEqual(ship.dots, (Dot(1, 2), Dot(1, 3), Dot(1, 4)))
+        self.assertTrue(ship.shooten(Dot(1, 4)))
+        self.assertFalse(ship.shooten(Dot(2, 2)))
+
+    def test_shot_finds_ship_through_cell_index(self):
+        board = Board(size=10)
+        ships = [Ship(Dot(x, 0), 4, 1) for x in range(0, 10, 2)]
+        for ship in ships:
+            board.add_ship(ship)
+        board.begin()
+
+        board.shot(Dot(4, 2))
+        self.assertEqual([s.lives for s in ships], [4, 4, 3, 4, 4])
+        for y in (0, 1, 3):
+            board.shot(Dot(4, y))
+        self.assertEqual(board.count, 1)
+
+    def test_placement_and_shots_are_tracked_separately(self):
+        board, _ = build_board_with_ship((0, 0), length=2, orientation=0)
+        self.assertIn(Dot(2, 1), board.occupied)
+        self.assertNotIn(Dot(2, 1), board.shots)
+        self.assertEqual(len(board.unshot), 36)
+
+        board.shot(Dot(4, 4))
+        self.assertIn(Dot(4, 4), board.shots)
+        self.assertNotIn(Dot(4, 4), board.unshot)
+        self.assertEqual(len(board.unshot), 35)
+
+        board.shot(Dot(0, 0))
+        board.shot(Dot(1, 0))
+        self.assertEqual(len(board.unshot), 36 - 1 - 6)
+        self.assertNotIn(Dot(2, 1), board.unshot)
+
+    def test_snapshot_round_trip(self):
+        board = Board(size=8)
+        board.add_ship(Ship(Dot(0, 0), 3, 1))
+        board.add_ship(Ship(Dot(4, 4), 2, 0))
+        board.begin()
+        for d in (Dot(0, 0), Dot(0, 1), Dot(0, 2), Dot(4, 4), Dot(7, 7)):
+            board.fire(d)
+        data = board.snapshot()
+
+        clone = Board.from_snapshot(memoryview(data))
+        self.assertEqual(clone.field, board.field)
+        self.assertEqual(clone.shots, board.shots)
+        self.assertEqual(clone.occupied, board.occupied)
+        self.assertEqual(clone.count, 1)
+        self.assertEqual([s.lives for s in clone.ships], [0, 1])
+        self.assertEqual(clone.snapshot(), data)
+
+        board.fire(Dot(5, 4))
+        board.restore(data)
+        self.assertEqual(board.count, 1)
+        self.assertIn(Dot(5, 4), board.unshot)
+        self.assertEqual(board.fire(Dot(5, 4)).code, SUNK)
+
+    def test_restore_rejects_foreign_data(self):
+        with self.assertRaises(ValueError):
+            Board(size=6).restore(b"XX" + bytes(20))
+
+
+class CellPoolTests(unittest.TestCase):
+    def test_discard_keeps_pool_consistent(self):
+        cells = [Dot(x, y) for x in range(3) for y in range(3)]
+        pool = CellPool(cells)
+        self.assertTrue(pool.discard(Dot(0, 0)))
+        self.assertFalse(pool.discard(Dot(0, 0)))
+        pool.discard(Dot(2, 2))
+        pool.discard(Dot(1, 1))
+
+        self.assertEqual(len(pool), 6)
+        self.assertEqual(set(pool), set(cells) - {Dot(0, 0), Dot(1, 1), Dot(2, 2)})
+        for d in pool:
+            self.assertIn(d, pool)
+        self.assertIn(pool.choice(), pool)
+
+
+class DotTests(unittest.TestCase):
+    def test_dot_is_hashable_and_immutable(self):
+        self.assertEqual(len({Dot(1, 2), Dot(1, 2), Dot(2, 1)}), 2)
+        self.assertEqual({Dot(1, 2): "a"}[Dot(1, 2)], "a")
+        with self.assertRaises(AttributeError):
+            Dot(1, 2).x = 5
+
+    def test_grid_shares_one_instance_per_cell(self):
+        grid = Dot.grid(6)
+        self.assertIs(grid, Dot.grid(6))
+        self.assertEqual(grid[2][3], Dot(2, 3))
+        self.assertIs(Board(size=6).grid[2][3], grid[2][3])
+        self.assertEqual(len(Dot.grid(8)), 8)
+
+    def test_dot_survives_pickle(self):
+        self.assertEqual(pickle.loads(pickle.dumps(Dot(3, 4))), Dot(3, 4))
+
+    def test_snapshot_keeps_halo_apart_from_misses(self):
+        board = Board(size=6)
+        board.add_ship(Ship(Dot(0, 0), 2, 1))
+        board.begin()
+        board.fire(Dot(1, 0))  # a real miss next to the ship
+        board.fire(Dot(0, 0))
+        board.fire(Dot(0, 1))  # sinks it and reveals the rest of the halo
+
+        clone = Board.from_snapshot(board.snapshot())
+        self.assertEqual(clone.halo, board.halo)
+        self.assertEqual(clone.halo, {Dot(0, 2), Dot(1, 1), Dot(1, 2)})
+        self.assertNotIn(Dot(1, 0), clone.halo)
+        self.assertEqual(clone.shots, board.shots)
+        self.assertEqual(clone.snapshot(), board.snapshot())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,87 @@
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.book import OpeningBook, best_shot, build_book, build_line, default_book
+from battleship.core import Board, Dot, MISS, SUNK, Ship
+from battleship.game import SHIPS_PRESETS, Game
+from battleship.heatmap import HeatmapAI
+
+
+class DummyUI:
+    def say(self, message):
+        pass
+
+    def prompt(self, message):
+        return ""
+
+
+class BookFileTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(fd)
+        build_book(self.path, presets={6: [3, 2, 1]}, depth=4)
+        self.book = OpeningBook(self.path)
+
+    def tearDown(self):
+        self.book.close()
+        os.remove(self.path)
+
+    def test_round_trip_keeps_the_tree(self):
+        nodes = build_line(6, [3, 2, 1], 4)
+        line = self.book.line(6, [1, 2, 3])
+        self.assertEqual(line.cell, nodes[0][0])
+        self.assertTrue(line.follow(MISS))
+        self.assertEqual(line.cell, nodes[nodes[0][1]][0])
+        self.assertIsNone(self.book.line(6, [3, 2]))
+
+    def test_root_is_the_densest_cell(self):
+        empty = [bytearray(6) for _ in range(6)]
+        self.assertEqual(self.book.line(6, [3, 2, 1]).cell, best_shot(6, [3, 2, 1], empty, empty))
+
+    def test_sink_leaves_the_book(self):
+        line = self.book.line(6, [3, 2, 1])
+        self.assertFalse(line.follow(SUNK))
+
+    def test_rejects_other_versions(self):
+        with open(self.path, "r+b") as f:
+            f.seek(6)
+            f.write(b"\x63")
+        with self.assertRaises(ValueError):
+            OpeningBook(self.path)
+
+
+class BookPlayTests(unittest.TestCase):
+    def test_default_book_covers_the_presets(self):
+        book = default_book()
+        self.assertIsNotNone(book)
+        for size, ships_config in SHIPS_PRESETS.items():
+            self.assertIsNotNone(book.line(size, ships_config))
+
+    def test_ai_opens_from_the_book(self):
+        enemy = Board(size=10)
+        enemy.add_ship(Ship(Dot(0, 0), 1, 0))
+        enemy.begin()
+        ai = HeatmapAI(Board(size=10), enemy, DummyUI(), ships_config=SHIPS_PRESETS[10])
+        ai.use_book(default_book())
+        root = ai.book_line.cell
+        ai.move()
+        self.assertIn(Dot(root // 10, root % 10), enemy.shots)
+        self.assertIsNotNone(ai.book_line)
+
+    def test_book_strategy_finishes_games(self):
+        random.seed(4)
+        game = Game(size=10, ships_config=SHIPS_PRESETS[10], ui=DummyUI(), ai_strategy="heatmap")
+        self.assertIsNotNone(game.ai.book_line)
+        while not game.is_winner(game.us.board):
+            game.ai_move()
+        self.assertIsNone(game.ai.book_line)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import random
+import sys
+from functools import lru_cache
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.bitboard import iter_bits
+from battleship.core import Board, Dot, Ship
+from battleship.endgame import EndgameSolver, TranspositionTable, enumerate_layouts
+from battleship.game import Game
+
+
+class DummyUI:
+    def say(self, message):
+        pass
+
+    def prompt(self, message):
+        return ""
+
+
+def brute_force(size, lengths, closed, hits):
+    layouts = enumerate_layouts(size, lengths, closed & ~hits, hits, limit=10 ** 6)
+    ships = {}
+    for layout in layouts:
+        cells = 0
+        for mask, _ in layout:
+            cells |= mask
+        ships[cells] = [mask for mask, _ in layout]
+
+    @lru_cache(maxsize=None)
+    def expected(left, hit):
+        candidates = 0
+        for cells in left:
+            candidates |= cells
+        candidates &= ~hit
+        if not candidates:
+            return 0.0
+        best = float("inf")
+        for cell in iter_bits(candidates):
+            bit = 1 << cell
+            groups = {}
+            for cells in left:
+                outcome = None
+                if cells & bit:
+                    ship = next(mask for mask in ships[cells] if mask & bit)
+                    outcome = ship if not ship & ~(hit | bit) else "hit"
+                groups.setdefault(outcome, []).append(cells)
+            total = 1 + sum(
+                len(members) / len(left) * expected(frozenset(members), hit if outcome is None else hit | bit)
+                for outcome, members in groups.items()
+            )
+            best = min(best, total)
+        return best
+
+    return expected(frozenset(ships), hits)
+
+
+class TranspositionTableTests(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        table = TranspositionTable(capacity=2)
+        table.put("a", 1)
+        table.put("b", 2)
+        table.get("a")
+        table.put("c", 3)
+        self.assertIsNone(table.get("b"))
+        self.assertEqual((table.get("a"), table.get("c"), len(table)), (1, 3, 2))
+
+
+class EndgameSolverTests(unittest.TestCase):
+    def test_single_cell_ship_takes_the_average_of_the_cells(self):
+        closed = (1 << 16) - 1
+        for cell in (0, 5, 10, 15):
+            closed &= ~(1 << cell)
+        expected, cell = EndgameSolver(4).solve([1], closed, 0)
+        self.assertEqual(expected, 2.5)
+        self.assertIn(cell, (0, 5, 10, 15))
+
+    def test_matches_brute_force(self):
+        rng = random.Random(0)
+        checked = 0
+        while checked < 12:
+            size = rng.choice([4, 5])
+            lengths = rng.choice([[2], [2, 1], [1, 1], [3], [2, 2]])
+            closed = 0
+            for cell in rng.sample(range(size * size), size * size // 2):
+                closed |= 1 << cell
+            hits = 0
+            layouts = enumerate_layouts(size, lengths, closed, 0, limit=14)
+            if not layouts:
+                continue
+            if rng.random() < 0.5:
+                # Wound one ship of a real layout.
+                mask = layouts[0][0][0]
+                if mask.bit_count() > 1:
+                    hits = 1 << next(iter_bits(mask))
+                    closed |= hits
+            solved = EndgameSolver(size, max_layouts=100).solve(lengths, closed, hits)
+            self.assertAlmostEqual(solved[0], brute_force(size, lengths, closed, hits))
+            checked += 1
+
+    def test_declines_large_positions(self):
+        solver = EndgameSolver(10)
+        self.assertIsNone(solver.solve([4, 3, 2, 1], 0, 0))
+        self.assertIsNone(solver.solve([2], 0, 0))
+
+
+class EndgameAITests(unittest.TestCase):
+    def test_ai_takes_over_near_the_end(self):
+        random.seed(3)
+        game = Game(size=6, ships_config=[2, 1], ui=DummyUI(), ai_strategy="montecarlo")
+        enemy = game.us.board
+        self.assertIsNotNone(game.ai.endgame)
+        while not game.is_winner(enemy):
+            game.ai_move()
+        self.assertGreater(len(game.ai.endgame.table), 0)
+
+    def test_finishes_a_wounded_ship(self):
+        enemy = Board(size=6)
+        enemy.add_ship(Ship(Dot(2, 2), 2, 1))
+        enemy.begin()
+        game = Game(size=6, ships_config=[2], ui=DummyUI(), ai_strategy="montecarlo")
+        game.ai.enemy = enemy
+        game.ai._process_shot_result(enemy.fire(Dot(2, 2)))
+        d = game.ai._endgame_move()
+        self.assertIn(d, (Dot(1, 2), Dot(3, 2), Dot(2, 1), Dot(2, 3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
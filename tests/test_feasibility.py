@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+import unittest
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.feasibility import (
+    UNKNOWN_PLACE_ATTEMPTS,
+    UNKNOWN_PLACE_STEPS,
+    FleetConfigError,
+    check_fleet,
+    exact_search,
+    fleet_feasibility,
+    quick_check,
+)
+from battleship.game import SHIPS_PRESETS, Game, GameConfig
+from battleship.generator import generate_board
+from battleship.placement import FleetGeometry
+
+
+class DummyUI:
+    def say(self, message):
+        pass
+
+    def prompt(self, message):
+        return ""
+
+
+class FeasibilityTests(unittest.TestCase):
+    def test_presets_are_feasible(self):
+        for size, config in SHIPS_PRESETS.items():
+            self.assertTrue(check_fleet(size, config))
+
+    def test_quick_bounds_reject_without_search(self):
+        self.assertIsNotNone(quick_check(FleetGeometry.of(6, [7])))
+        self.assertIsNotNone(quick_check(FleetGeometry.of(6, [0])))
+        self.assertIsNotNone(quick_check(FleetGeometry.of(3, [1, 1, 1, 1, 1])))
+        self.assertIsNone(quick_check(FleetGeometry.of(3, [1, 1, 1, 1])))
+
+    def test_ship_count_bound(self):
+        # At most 25 ships keep apart on 10x10, one per 2x2 block.
+        self.assertIsNotNone(quick_check(FleetGeometry.of(10, [1] * 26)))
+        self.assertIsNone(quick_check(FleetGeometry.of(10, [1] * 25)))
+        self.assertIsNotNone(quick_check(FleetGeometry.of(10, [3] * 13)))
+        with self.assertRaises(FleetConfigError):
+            GameConfig(size=10, ships_config=[1] * 30)
+
+    def test_exact_search_rejects_what_bounds_miss(self):
+        self.assertIsNone(quick_check(FleetGeometry.of(7, [4] * 6)))
+        with self.assertRaises(FleetConfigError):
+            check_fleet(7, [4] * 6)
+        self.assertTrue(check_fleet(3, [1, 1, 1, 1]))
+
+    def test_exact_search_leaves_recursion_limit_alone(self):
+        # One search level per ship: 36 ships fill an 11x11 board exactly.
+        # The limit is process-wide, so the search must not touch it.
+        with mock.patch.object(sys, "setrecursionlimit", side_effect=AssertionError):
+            self.assertTrue(exact_search(FleetGeometry.of(11, [1] * 36)))
+
+    def test_large_boards_past_bounds_are_unknown(self):
+        self.assertEqual(fleet_feasibility(FleetGeometry.of(40, [5] * 20)), (None, None))
+
+    def test_unknown_fleets_get_a_small_placement_budget(self):
+        fleet = [2] * 32
+        self.assertEqual(fleet_feasibility(FleetGeometry.of(13, fleet)), (None, None))
+        with mock.patch("battleship.generator.place_fleet", return_value=None) as place:
+            with self.assertRaises(FleetConfigError):
+                generate_board(13, fleet, 0, 0)
+        self.assertEqual(place.call_count, UNKNOWN_PLACE_ATTEMPTS)
+        self.assertEqual(place.call_args.kwargs["max_steps"], UNKNOWN_PLACE_STEPS * len(fleet))
+
+    def test_game_fails_fast_on_bad_config(self):
+        with self.assertRaises(FleetConfigError):
+            GameConfig(size=2, ships_config=[1, 1])
+        with self.assertRaises(FleetConfigError):
+            Game(size=6, ships_config=[3] * 5, ui=DummyUI())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.bitboard import BitBoard
+from battleship.game import SHIPS_PRESETS
+from battleship.generator import generate_board, generate_boards, read_boards, write_boards
+
+
+class GeneratorTests(unittest.TestCase):
+    def test_boards_are_reproducible_from_seed_and_index(self):
+        config = SHIPS_PRESETS[10]
+        batch = list(generate_boards(10, config, 5, seed=42))
+        tail = list(generate_boards(10, config, 2, seed=42, start=3))
+
+        self.assertEqual([b.field for b in batch[3:]], [b.field for b in tail])
+        self.assertEqual(batch[4].field, generate_board(10, config, 42, 4).field)
+        self.assertNotEqual(batch[0].field, batch[1].field)
+        self.assertNotEqual(batch[0].field, generate_board(10, config, 43, 0).field)
+
+    def test_generator_is_lazy(self):
+        gen = generate_boards(6, SHIPS_PRESETS[6], 10 ** 9, seed=1, encode=True)
+        data = next(gen)
+        self.assertIsInstance(data, bytes)
+
+    def test_file_round_trip(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            self.assertEqual(write_boards(path, 8, SHIPS_PRESETS[8], 4, seed=9), 4)
+            boards = list(read_boards(path))
+        finally:
+            os.remove(path)
+        expected = list(generate_boards(8, SHIPS_PRESETS[8], 4, seed=9))
+        self.assertEqual([b.field for b in boards], [b.field for b in expected])
+        self.assertTrue(all(b.started for b in boards))
+
+    def test_bitboards_encode_and_read_back(self):
+        encoded = list(generate_boards(8, SHIPS_PRESETS[8], 3, seed=4, encode=True, board_cls=BitBoard))
+        plain = list(generate_boards(8, SHIPS_PRESETS[8], 3, seed=4, encode=True))
+        self.assertEqual(encoded, plain)
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            write_boards(path, 8, SHIPS_PRESETS[8], 3, seed=4)
+            boards = list(read_boards(path, board_cls=BitBoard))
+        finally:
+            os.remove(path)
+        self.assertTrue(all(isinstance(b, BitBoard) and b.started for b in boards))
+        self.assertEqual([b.snapshot() for b in boards], plain)
+
+
+if __name__ == "__main__":
+    unittest.main()
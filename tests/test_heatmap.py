@@ -0,0 +1,165 @@
+import random
+import sys
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.core import Board, Dot, Ship
+from battleship.game import Game
+from battleship.heatmap import DensityMap, HeatmapAI, KernelDensity, board_masks, density_map, np
+from battleship.placement import placement_table
+
+
+class DummyUI:
+    def say(self, message):
+        pass
+
+    def prompt(self, message):
+        return ""
+
+
+def recount(size, fleet, blocked=()):
+    heat = [0] * (size * size)
+    for length, weight in fleet.items():
+        table = placement_table(size, length)
+        for j in range(len(table)):
+            cells = list(table.cells(j))
+            if any(c in blocked for c in cells):
+                continue
+            for c in cells:
+                heat[c] += weight
+    return heat
+
+
+def play(ai_cls, seed, size=10):
+    random.seed(seed)
+    game = Game(size=size, ships_config=[4, 3, 3, 2, 2, 2, 1, 1, 1, 1], ui=DummyUI())
+    enemy = game.us.board
+    ai = ai_cls(game.ai.board, enemy, DummyUI(), rng=random.Random(seed))
+    shots = 0
+    while enemy.count < len(enemy.ships):
+        ai.move()
+        shots += 1
+    return shots
+
+
+class DensityMapTests(unittest.TestCase):
+    def test_fresh_map_counts_every_position(self):
+        density = DensityMap(6, [3, 2, 2])
+        self.assertEqual(density.heat, recount(6, density.fleet))
+
+    def test_incremental_updates_match_recount(self):
+        rng = random.Random(3)
+        density = DensityMap(8, [3, 2, 2, 1], rng=rng)
+        blocked = rng.sample(range(64), 20)
+        for cell in blocked:
+            density.block(cell)
+        density.sink(2)
+        self.assertEqual(density.heat, recount(8, density.fleet, set(blocked)))
+
+    def test_best_skips_closed_cells(self):
+        density = DensityMap(5, [3])
+        center = 2 * 5 + 2
+        self.assertEqual(density.best(), center)
+        density.close(center)
+        self.assertNotEqual(density.best(), center)
+
+
+class DensityKernelTests(unittest.TestCase):
+    def random_masks(self, rng, size, wounded):
+        blocked = [[int(rng.random() < 0.3) for _ in range(size)] for _ in range(size)]
+        must = [[0] * size for _ in range(size)]
+        if wounded:
+            x, y = rng.randrange(size), rng.randrange(size - 1)
+            for cy in (y, y + 1):
+                blocked[x][cy] = 0
+                must[x][cy] = 1
+        return blocked, must
+
+    def test_python_kernel_matches_density_map(self):
+        rng = random.Random(2)
+        density = DensityMap(8, [3, 2, 2, 1], rng=rng)
+        blocked = [[0] * 8 for _ in range(8)]
+        for cell in rng.sample(range(64), 15):
+            density.block(cell)
+            blocked[cell // 8][cell % 8] = 1
+        heat = density_map(8, [3, 2, 2, 1], blocked, use_numpy=False)
+        self.assertEqual([h for row in heat for h in row], density.heat)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_and_python_kernels_agree(self):
+        rng = random.Random(4)
+        for size in (6, 10, 17):
+            for wounded in (False, True):
+                blocked, must = self.random_masks(rng, size, wounded)
+                config = [4, 3, 3, 2, 1]
+                self.assertEqual(
+                    density_map(size, config, blocked, must).tolist(),
+                    density_map(size, config, blocked, must, use_numpy=False),
+                )
+
+    def test_board_masks_split_wounded_ships_from_wrecks(self):
+        board = Board(size=6)
+        board.add_ship(Ship(Dot(0, 0), 2, 0))
+        board.add_ship(Ship(Dot(4, 4), 2, 1))
+        board.begin()
+        for d in (Dot(0, 0), Dot(1, 0), Dot(4, 4), Dot(3, 3)):
+            board.fire(d)
+        blocked, must = board_masks(board)
+        self.assertEqual(must[4][4], 1)
+        self.assertEqual(blocked[4][4], 0)
+        self.assertEqual((blocked[0][0], blocked[1][0], blocked[2][1], blocked[3][3]), (1, 1, 1, 1))
+        self.assertEqual(sum(map(sum, must)), 1)
+
+
+class HeatmapAITests(unittest.TestCase):
+    def test_follows_the_line_of_a_wounded_ship(self):
+        enemy = Board(size=6)
+        enemy.add_ship(Ship(Dot(2, 1), 3, 1))
+        enemy.begin()
+        ai = HeatmapAI(Board(size=6), enemy, DummyUI(), rng=random.Random(0))
+        for d in (Dot(2, 1), Dot(2, 2)):
+            ai._process_shot_result(enemy.fire(d))
+        self.assertIn(ai.ask(), (Dot(2, 0), Dot(2, 3)))
+
+    def test_mid_game_board_matches_an_ai_that_saw_the_shots(self):
+        enemy = Board(size=6)
+        enemy.add_ship(Ship(Dot(0, 0), 2, 0))
+        enemy.add_ship(Ship(Dot(4, 4), 2, 1))
+        enemy.add_ship(Ship(Dot(2, 3), 1, 0))
+        enemy.begin()
+        watcher = HeatmapAI(Board(size=6), enemy, DummyUI())
+        for d in (Dot(0, 0), Dot(1, 0), Dot(4, 4), Dot(3, 3)):
+            watcher._process_shot_result(enemy.fire(d))
+        ai = HeatmapAI(Board(size=6), Board.from_snapshot(enemy.snapshot()), DummyUI())
+        self.assertEqual(ai.density.fleet, watcher.density.fleet)
+        self.assertEqual(ai.density.heat, watcher.density.heat)
+        self.assertEqual(ai.density.closed, watcher.density.closed)
+        self.assertEqual([ship.l for ship in ai.sunk], [2])
+
+    def test_sinks_the_fleet_without_repeating_shots(self):
+        for seed in range(3):
+            self.assertLessEqual(play(HeatmapAI, seed), 100)
+
+    def test_large_boards_use_the_kernel(self):
+        self.assertLess(play(HeatmapAI, 0, size=40), 40 * 40)
+        enemy = Board(size=40)
+        ai = HeatmapAI(Board(size=40), enemy, DummyUI(), ships_config=[3, 2])
+        self.assertIsInstance(ai.density, KernelDensity)
+
+    def test_map_matches_recount_between_ships(self):
+        random.seed(5)
+        game = Game(size=10, ships_config=[4, 3, 3, 2, 2, 2, 1, 1, 1, 1], ui=DummyUI())
+        enemy = game.us.board
+        ai = HeatmapAI(game.ai.board, enemy, DummyUI(), rng=random.Random(1))
+        while enemy.count < len(enemy.ships):
+            if not ai.hits:
+                # Between ships every closed cell is a miss, halo or wreck.
+                blocked = {d.x * 10 + d.y for d in enemy.shots}
+                self.assertEqual(ai.density.heat, recount(10, ai.density.fleet, blocked))
+            ai.move()
+
+
+if __name__ == "__main__":
+    unittest.main()
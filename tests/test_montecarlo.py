@@ -0,0 +1,167 @@
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.core import Board, Dot, Ship
+from battleship.game import Game
+from battleship.montecarlo import MonteCarloAI, sample_counts, sample_layout
+from battleship.placement import placement_table
+
+
+class DummyUI:
+    def say(self, message):
+        pass
+
+    def prompt(self, message):
+        return ""
+
+
+def board_from(size, layout):
+    board = Board(size=size)
+    for length, j in layout:
+        board.add_ship(placement_table(size, length).ship(j))
+    return board
+
+
+class SamplingTests(unittest.TestCase):
+    def test_layouts_avoid_blocked_cells_and_cover_hits(self):
+        rng = random.Random(1)
+        blocked = 0
+        for cell in (0, 7, 14, 21, 28, 35):
+            blocked |= 1 << cell
+        hits = [2 * 6 + 3, 2 * 6 + 4]
+        for _ in range(50):
+            layout = sample_layout(6, [3, 2, 2, 1], blocked, hits, rng)
+            board = board_from(6, layout)
+            cells = {d.x * 6 + d.y for ship in board.ships for d in ship.dots}
+            self.assertFalse(any(blocked >> c & 1 for c in cells))
+            self.assertTrue(set(hits) <= cells)
+
+    def test_counts_are_reproducible_per_seed(self):
+        first = sample_counts(8, [3, 2, 1], 0, [], 5, 50)
+        self.assertEqual(first, sample_counts(8, [3, 2, 1], 0, [], 5, 50))
+        drawn, counts = first
+        self.assertEqual(drawn, 50)
+        self.assertEqual(sum(counts), 50 * 6)
+
+
+class MonteCarloAITests(unittest.TestCase):
+    def test_sinks_the_fleet(self):
+        random.seed(2)
+        game = Game(size=6, ui=DummyUI())
+        enemy = game.us.board
+        ai = MonteCarloAI(game.ai.board, enemy, DummyUI(), samples=50, workers=1, seed=2)
+        for _ in range(36):
+            if enemy.count == len(enemy.ships):
+                break
+            ai.move()
+        self.assertEqual(enemy.count, len(enemy.ships))
+
+    def test_follows_the_line_of_a_wounded_ship(self):
+        enemy = Board(size=6)
+        enemy.add_ship(Ship(Dot(2, 1), 3, 1))
+        enemy.begin()
+        ai = MonteCarloAI(Board(size=6), enemy, DummyUI(), samples=50, workers=1, seed=0)
+        for d in (Dot(2, 1), Dot(2, 2)):
+            ai._process_shot_result(enemy.fire(d))
+        self.assertIn(ai.ask(), (Dot(2, 0), Dot(2, 3)))
+
+    def test_mid_game_board_keeps_sunk_ships_out_of_the_samples(self):
+        enemy = Board(size=6)
+        enemy.add_ship(Ship(Dot(0, 0), 2, 0))
+        enemy.add_ship(Ship(Dot(4, 4), 2, 1))
+        enemy.begin()
+        watcher = MonteCarloAI(Board(size=6), enemy, DummyUI(), samples=50, workers=1, seed=0)
+        for d in (Dot(0, 0), Dot(1, 0), Dot(3, 3)):
+            watcher._process_shot_result(enemy.fire(d))
+        restored = Board.from_snapshot(enemy.snapshot())
+        ai = MonteCarloAI(Board(size=6), restored, DummyUI(), samples=50, workers=1, seed=0)
+        self.assertEqual(ai.fleet, watcher.fleet)
+        self.assertEqual(ai.blocked, watcher.blocked)
+        counts = ai.sample_counts()
+        self.assertFalse(counts[0] or counts[6])
+
+    def test_pool_results_do_not_depend_on_the_executor(self):
+        enemy = Board(size=8)
+        enemy.begin()
+        with ThreadPoolExecutor(2) as executor:
+            threaded = MonteCarloAI(Board(size=8), enemy, DummyUI(), ships_config=[3, 2, 1],
+                                    samples=40, workers=2, executor=executor, seed=9)
+            expected = threaded.sample_counts()
+        ai = MonteCarloAI(Board(size=8), enemy, DummyUI(), ships_config=[3, 2, 1],
+                          samples=40, workers=2, seed=9)
+        try:
+            self.assertEqual(ai.sample_counts(), expected)
+            self.assertEqual(ai.drawn, 40)
+        finally:
+            ai.close()
+
+    def test_context_manager_shuts_its_pool_down(self):
+        enemy = Board(size=6)
+        enemy.begin()
+        with MonteCarloAI(Board(size=6), enemy, DummyUI(), ships_config=[2, 1],
+                          samples=10, workers=2, seed=3) as ai:
+            ai.sample_counts()
+            executor = ai._executor
+            self.assertIsNotNone(executor)
+        self.assertIsNone(ai._executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(int)
+
+    def test_game_closes_the_ai_when_it_ends(self):
+        game = Game(size=6, ui=DummyUI(), ai_strategy="montecarlo")
+        closed = []
+        game.ai.close = lambda: closed.append(True)
+        game.loop = lambda: None
+        game.ui.greet = lambda: None
+        game.start()
+        self.assertEqual(closed, [True])
+
+
+class AnytimeTests(unittest.TestCase):
+    def make_ai(self, samples, workers=1):
+        enemy = Board(size=10)
+        enemy.add_ship(Ship(Dot(5, 5), 3, 0))
+        enemy.begin()
+        return MonteCarloAI(Board(size=10), enemy, DummyUI(), ships_config=[3, 2, 2, 1],
+                            samples=samples, workers=workers, seed=1)
+
+    def test_without_deadline_every_round_runs(self):
+        ai = self.make_ai(samples=100)
+        ai.move()
+        self.assertEqual(ai.last_report["rounds"], 4)
+        self.assertEqual(ai.last_report["source"], "search")
+        self.assertEqual(ai.drawn, 100)
+
+    def test_deadline_cuts_the_rounds_short(self):
+        ai = self.make_ai(samples=10 ** 6)
+        ai.deadline = time.perf_counter() + 0.05
+        ai.move()
+        report = ai.last_report
+        self.assertGreaterEqual(report["rounds"], 1)
+        self.assertLess(report["rounds"], 10 ** 6 // 25)
+        self.assertLess(report["elapsed_ms"], 150)
+
+    def test_a_past_deadline_still_plays_a_sampled_cell(self):
+        ai = self.make_ai(samples=500)
+        ai.deadline = time.perf_counter() - 1
+        d = ai.ask()
+        self.assertEqual(ai.rounds, 1)
+        self.assertNotIn(d, ai.enemy.shots)
+
+    def test_a_past_deadline_still_samples_on_the_pool(self):
+        with self.make_ai(samples=500, workers=2) as ai:
+            ai.deadline = time.perf_counter() - 1
+            ai.move()
+            self.assertEqual(ai.last_report["source"], "search")
+            self.assertGreaterEqual(ai.last_report["rounds"], 1)
+            self.assertGreater(ai.drawn, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import sys
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.core import Board, Dot, Ship, BoardWrongShipException
+from battleship.game import GameConfig, SHIPS_PRESETS
+from battleship.placement import FleetGeometry, cells_mask, place_fleet, placement_table
+
+
+class PlacementTests(unittest.TestCase):
+    def test_presets_produce_complete_fleets(self):
+        for size, config in SHIPS_PRESETS.items():
+            board = place_fleet(size, config, rng=random.Random(size))
+            self.assertEqual(sorted(s.l for s in board.ships), sorted(config))
+
+    def test_same_seed_gives_same_board(self):
+        a = place_fleet(10, SHIPS_PRESETS[10], rng=random.Random(7))
+        b = place_fleet(10, SHIPS_PRESETS[10], rng=random.Random(7))
+        self.assertEqual(a.field, b.field)
+
+    def test_backtracks_into_the_only_layout(self):
+        # Four single cells fit on a 3x3 board only in the corners.
+        for seed in range(20):
+            board = place_fleet(3, [1, 1, 1, 1], rng=random.Random(seed))
+            cells = {d for s in board.ships for d in s.dots}
+            self.assertEqual(cells, {Dot(0, 0), Dot(0, 2), Dot(2, 0), Dot(2, 2)})
+
+    def test_infeasible_fleet_returns_none(self):
+        self.assertIsNone(place_fleet(2, [1, 1]))
+
+    def test_tables_are_shared_and_cover_every_position(self):
+        table = placement_table(6, 3)
+        self.assertIs(table, placement_table(6, 3))
+        self.assertEqual(len(table), 2 * 4 * 6)
+        self.assertEqual(len(placement_table(6, 3, 1)), 4 * 6)
+        self.assertEqual(len(placement_table(6, 1)), 36)
+        self.assertEqual(len(placement_table(3, 4)), 0)
+
+    def test_open_positions_match_board_validation(self):
+        board = Board(size=6)
+        board.add_ship(Ship(Dot(2, 1), 3, 1))
+        table = placement_table(6, 2, 0)
+        opened = {(table.xs[i], table.ys[i]) for i in table.open(cells_mask(board.occupied, 6))}
+
+        expected = set()
+        for x in range(6):
+            for y in range(6):
+                try:
+                    _probe_copy(board).add_ship(Ship(Dot(x, y), 2, 0))
+                except BoardWrongShipException:
+                    continue
+                expected.add((x, y))
+        self.assertEqual(opened, expected)
+
+    def test_covering_lists_positions_through_a_cell(self):
+        table = placement_table(6, 3)
+        for i in range(len(table)):
+            self.assertEqual(set(table.cells(i)), {d.x * 6 + d.y for d in table.ship(i).dots})
+        corner = table.covering(0)
+        self.assertEqual(len(corner), 2)
+        self.assertEqual(len(table.covering(2 * 6 + 2)), 6)
+
+    def test_geometry_is_a_hashable_key(self):
+        config = GameConfig(size=6, ships_config=[1, 2, 3])
+        self.assertEqual(config.geometry(), FleetGeometry(6, (3, 2, 1)))
+        self.assertEqual({config.geometry(): 1}[FleetGeometry.of(6, [2, 3, 1])], 1)
+
+
+def _probe_copy(board):
+    return Board.from_snapshot(board.snapshot())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.bitboard import BitBoard
+from battleship.game import SHIPS_PRESETS, Game
+from battleship.pool import BoardPool
+
+
+class DummyUI:
+    def say(self, message):
+        pass
+
+    def prompt(self, message):
+        return ""
+
+
+def wait_ready(pool, size, config, count, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while pool.ready(size, config) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class BoardPoolTests(unittest.TestCase):
+    def test_take_counts_hits_and_misses(self):
+        config = SHIPS_PRESETS[8]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pool = BoardPool(capacity=2, executor=executor, seed=1)
+            self.assertIsNone(pool.take(8, config))
+            wait_ready(pool, 8, config, 2)
+
+            board = pool.take(8, config)
+            self.assertEqual(len(board.ships), len(config))
+            self.assertTrue(board.started)
+            self.assertEqual(pool.stats()["hits"], 1)
+            self.assertEqual(pool.stats()["misses"], 1)
+            pool.cancel()
+            self.assertEqual(pool.stats()["ready"], 0)
+            self.assertIsNone(pool.take(8, config))
+
+    def test_game_takes_boards_from_process_pool(self):
+        config = SHIPS_PRESETS[10]
+        with BoardPool(capacity=2, workers=2, seed=3) as pool:
+            pool.prefill(10, config)
+            wait_ready(pool, 10, config, 2)
+            game = Game(size=10, ships_config=config, ui=DummyUI(), board_pool=pool)
+            self.assertEqual(pool.hits, 2)
+            self.assertEqual(len(game.ai.board.ships), len(config))
+            self.assertTrue(game.ai.board.hid)
+
+    def test_take_builds_bitboards(self):
+        config = SHIPS_PRESETS[8]
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pool = BoardPool(capacity=1, executor=executor, seed=2)
+            pool.prefill(8, config)
+            wait_ready(pool, 8, config, 1)
+            board = pool.take(8, config, board_cls=BitBoard)
+            pool.cancel()
+        self.assertIsInstance(board, BitBoard)
+        self.assertEqual(len(board.ships), len(config))
+        self.assertEqual(board.ship_mask.bit_count(), sum(config))
+        self.assertTrue(board.started)
+
+
+if __name__ == "__main__":
+    unittest.main()
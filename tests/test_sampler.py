@@ -0,0 +1,46 @@
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.game import SHIPS_PRESETS
+from battleship.sampler import CountLimitExceeded, FleetSampler, count_layouts
+
+
+class FleetSamplerTests(unittest.TestCase):
+    def test_counts_match_brute_force(self):
+        # Checked against enumerating every combination of positions.
+        self.assertEqual(count_layouts(4, [2, 1, 1]), 380)
+        self.assertEqual(count_layouts(4, [3, 1]), 96)
+        self.assertEqual(count_layouts(5, [2, 2, 1]), 3888)
+        self.assertEqual(count_layouts(2, [1, 1]), 0)
+
+    def test_preset_six_count(self):
+        self.assertEqual(count_layouts(6, SHIPS_PRESETS[6]), 526888)
+
+    def test_samples_are_valid_fleets(self):
+        sampler = FleetSampler(8, SHIPS_PRESETS[8])
+        for board in sampler.samples(20, rng=random.Random(2)):
+            self.assertEqual(sorted(s.l for s in board.ships), sorted(SHIPS_PRESETS[8]))
+
+    def test_samples_are_uniform(self):
+        sampler = FleetSampler(4, [3, 1])
+        rng = random.Random(4)
+        draws = 9600
+        seen = Counter(tuple(sorted(sampler.sample_positions(rng))) for _ in range(draws))
+        self.assertEqual(len(seen), 96)
+        expected = draws / 96
+        chi2 = sum((n - expected) ** 2 / expected for n in seen.values())
+        # 95 degrees of freedom; 150 is far past the 0.999 quantile.
+        self.assertLess(chi2, 150)
+
+    def test_reports_configs_too_large_to_count(self):
+        with self.assertRaises(CountLimitExceeded):
+            FleetSampler(8, SHIPS_PRESETS[8], max_states=100)
+
+
+if __name__ == "__main__":
+    unittest.main()
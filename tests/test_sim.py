@@ -0,0 +1,80 @@
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+import unittest
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.sim import histogram, play_game, report, simulate, summary
+from battleship.strategies import STRATEGIES, StrategyEngine
+
+FLEET = [3, 2, 2, 1, 1, 1, 1]
+
+
+class SimTests(unittest.TestCase):
+    def test_game_is_reproducible(self):
+        first = play_game(6, FLEET, seed=3, index=5)
+        self.assertEqual(first, play_game(6, FLEET, seed=3, index=5))
+        winner, shots = first
+        self.assertIn(winner, (0, 1))
+        # Sinking the fleet takes at least one shot per ship cell.
+        self.assertGreaterEqual(shots[winner], sum(FLEET))
+        self.assertLessEqual(shots[winner], 36)
+
+    def test_game_leaves_the_global_random_state_alone(self):
+        for name in STRATEGIES:
+            random.seed(7)
+            state = random.getstate()
+            play_game(6, FLEET, (name, "hunt"), seed=2, index=1)
+            self.assertEqual(random.getstate(), state, name)
+
+    def test_search_strategies_are_reproducible(self):
+        # Without budgets the sampler and the heat map do a fixed amount of
+        # work per move, whatever the machine load.
+        first = play_game(6, [3, 2, 2], ("montecarlo", "heatmap"), seed=3, index=2)
+        self.assertEqual(first, play_game(6, [3, 2, 2], ("montecarlo", "heatmap"), seed=3, index=2))
+
+    def test_moves_go_through_the_strategy_engine(self):
+        timed = []
+        move = StrategyEngine.move
+
+        def record(engine):
+            result = move(engine)
+            timed.append(engine.timed)
+            return result
+
+        with mock.patch.object(StrategyEngine, "move", autospec=True, side_effect=record) as patched:
+            winner, shots = play_game(6, FLEET, ("random", "heatmap"), seed=0, index=0)
+            self.assertEqual(patched.call_count, sum(shots))
+            self.assertEqual({call.args[0].strategy.name for call in patched.call_args_list}, {"random", "heatmap"})
+            self.assertEqual(set(timed), {False})
+            timed.clear()
+            play_game(6, FLEET, ("random", "heatmap"), seed=0, index=0, budgets=True)
+            self.assertEqual(set(timed), {True})
+
+    def test_simulate_counts_every_game(self):
+        result = simulate(10, 6, FLEET, ("random", "hunt"), seed=1)
+        self.assertEqual(sum(result["wins"]), 10)
+        self.assertEqual(sum(result["shots_to_win"].values()), 10)
+        self.assertGreater(result["games_per_sec"], 0)
+        text = report(result)
+        self.assertIn("games/s", text)
+        self.assertIn("shots to win", text)
+
+    def test_summary_and_histogram(self):
+        to_win = Counter({20: 1, 22: 2, 30: 1})
+        stats = summary(to_win)
+        self.assertEqual(stats["min"], 20)
+        self.assertEqual(stats["max"], 30)
+        self.assertEqual(stats["median"], 22)
+        self.assertEqual(stats["mean"], 23.5)
+        lines = histogram(to_win, rows=11)
+        self.assertEqual(len(lines), 11)
+        self.assertEqual(sum(int(line.split()[1]) for line in lines), 4)
+        self.assertEqual(summary(Counter()), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import random
+import sys
+import time
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.core import Board, Dot, Ship
+from battleship.endgame import EndgameSolver
+from battleship.game import Game, GameConfig, create_game
+from battleship.heatmap import HeatmapAI
+from battleship.montecarlo import MonteCarloAI
+from battleship.players import AI, RandomAI
+from battleship.strategies import STRATEGIES, TIERS, Strategy, StrategyEngine, get_strategy
+
+
+class DummyUI:
+    def say(self, message):
+        pass
+
+    def prompt(self, message):
+        return ""
+
+
+class SlowAI:
+    deadline = None
+
+    def __init__(self, pause):
+        self.pause = pause
+        self.deadlines = []
+
+    def move(self):
+        self.deadlines.append(self.deadline)
+        time.sleep(self.pause)
+        return False
+
+
+class RegistryTests(unittest.TestCase):
+    def test_every_tier_has_a_strategy(self):
+        for tier in TIERS:
+            self.assertEqual(get_strategy(tier).tier, tier)
+        self.assertIs(get_strategy("heatmap").factory, HeatmapAI)
+        self.assertIs(get_strategy(None), STRATEGIES["hunt"])
+
+    def test_unknown_strategy_is_rejected(self):
+        with self.assertRaises(ValueError):
+            get_strategy("psychic")
+        with self.assertRaises(ValueError):
+            GameConfig(size=6, ai_strategy="psychic")
+
+    def test_config_selects_the_ai_class(self):
+        expected = {"easy": RandomAI, "normal": AI, "hard": HeatmapAI, "expert": MonteCarloAI}
+        for tier, cls in expected.items():
+            game = create_game(GameConfig(size=6, ai_strategy=tier), ui=DummyUI())
+            self.assertIs(type(game.ai), cls)
+            self.assertIs(game.ai_engine.ai, game.ai)
+
+    def test_every_strategy_sinks_the_fleet(self):
+        for name in STRATEGIES:
+            random.seed(1)
+            game = Game(size=6, ui=DummyUI(), ai_strategy=name)
+            for _ in range(36):
+                if game.is_winner(game.us.board):
+                    break
+                game.ai_move()
+            self.assertTrue(game.is_winner(game.us.board), name)
+            self.assertGreater(game.ai_engine.stats()["moves"], 0)
+
+
+class EngineTests(unittest.TestCase):
+    def test_engine_sets_a_deadline_and_counts_overruns(self):
+        ai = SlowAI(0.02)
+        engine = StrategyEngine(Strategy("slow", "easy", 5, SlowAI), ai)
+        before = time.perf_counter()
+        engine.move()
+        self.assertGreater(ai.deadlines[0], before)
+        self.assertIsNone(ai.deadline)
+        stats = engine.stats()
+        self.assertEqual((stats["moves"], stats["overruns"]), (1, 1))
+        self.assertGreaterEqual(stats["worst_ms"], 20)
+
+    def test_untimed_engine_sets_no_deadline(self):
+        ai = SlowAI(0)
+        engine = StrategyEngine(Strategy("slow", "easy", 5, SlowAI), ai, timed=False)
+        engine.move()
+        self.assertEqual(ai.deadlines, [None])
+        self.assertEqual(engine.stats()["moves"], 1)
+
+    def test_each_move_reports_rounds_and_time(self):
+        random.seed(0)
+        game = Game(size=6, ui=DummyUI(), ai_strategy="hard")
+        game.ai_move()
+        report = game.ai_engine.last_report
+        self.assertIn(report["source"], ("book", "search"))
+        self.assertGreaterEqual(report["move_ms"], report["elapsed_ms"])
+        self.assertEqual(report["budget_ms"], 50)
+        self.assertIn("mean_rounds", game.ai_engine.stats())
+
+    def test_sampling_stops_at_the_deadline(self):
+        enemy = Board(size=10)
+        enemy.begin()
+        ai = MonteCarloAI(Board(size=10), enemy, DummyUI(), ships_config=[4, 3, 2],
+                          samples=10000, workers=1, seed=0)
+        ai.deadline = time.perf_counter()
+        ai.sample_counts()
+        self.assertLess(ai.drawn, 10000)
+        self.assertGreater(ai.drawn, 0)
+
+
+class BudgetTests(unittest.TestCase):
+    # Slack for the last check before the deadline plus the shot itself.
+    TOLERANCE_MS = 30
+
+    def enemy(self, size, ships):
+        board = Board(size=size)
+        for x, y, length in ships:
+            board.add_ship(Ship(Dot(x, y), length, 1))
+        board.begin()
+        return board
+
+    def play(self, strategy, enemy, moves, solver=None):
+        ai = strategy.create(Board(size=enemy.size), enemy, DummyUI())
+        if solver is not None:
+            ai.use_endgame(solver)
+        engine = StrategyEngine(strategy, ai)
+        for _ in range(moves):
+            engine.move()
+        return engine
+
+    def test_heavy_map_stays_within_budget(self):
+        # Past 32 cells a side the heatmap reruns the full kernel per move.
+        enemy = self.enemy(200, [(7 * i, 3, 5) for i in range(25)])
+        strategy = Strategy("heavy-map", "hard", 5, HeatmapAI)
+        engine = self.play(strategy, enemy, 6)
+        self.assertLess(engine.worst * 1000, strategy.budget_ms + self.TOLERANCE_MS)
+
+    def test_endgame_search_stops_at_the_deadline(self):
+        # Without its size limits the solver would search far past the budget.
+        enemy = self.enemy(10, [(0, 0, 3), (5, 5, 3), (8, 0, 2)])
+        strategy = Strategy("heavy-endgame", "hard", 10, HeatmapAI)
+        solver = EndgameSolver(10, max_layouts=10 ** 6, max_states=10 ** 7)
+        engine = self.play(strategy, enemy, 4, solver)
+        self.assertLess(engine.worst * 1000, strategy.budget_ms + self.TOLERANCE_MS)
+        self.assertEqual(engine.moves, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from battleship.sim import play_game
+from battleship.tournament import Tournament, mean_interval, pairings, play_batch, wilson_interval
+
+PRESETS = {6: [3, 2, 2, 1, 1, 1, 1]}
+
+
+class TournamentTests(unittest.TestCase):
+    def test_batch_totals_match_single_games(self):
+        fleet = PRESETS[6]
+        wins = [0, 0]
+        shots = [0, 0]
+        for index in range(3, 9):
+            winner, fired = play_game(6, fleet, ("random", "hunt"), 7, index)
+            wins[winner] += 1
+            shots[winner] += fired[winner]
+        batch = play_batch(6, fleet, ("random", "hunt"), 7, 3, 6)
+        self.assertEqual(list(batch[:2]), wins)
+        self.assertEqual(list(batch[2:4]), shots)
+
+    def test_results_do_not_depend_on_batching_or_workers(self):
+        inline = Tournament(["random", "hunt"], PRESETS, games=12, seed=5, workers=1, batch=5).run()
+        with Tournament(["random", "hunt"], PRESETS, games=12, seed=5, workers=2, batch=4) as pooled:
+            spread = pooled.run()
+        self.assertEqual(inline["matchups"], spread["matchups"])
+        self.assertEqual(inline["games"], 12)
+
+    def test_search_results_do_not_depend_on_workers(self):
+        # The sampler's moves would vary with the load on a wall-clock budget.
+        presets = {6: [3, 2, 2]}
+        inline = Tournament(["montecarlo", "hunt"], presets, games=2, seed=3, workers=1, batch=1).run()
+        with Tournament(["montecarlo", "hunt"], presets, games=2, seed=3, workers=2, batch=1) as pooled:
+            spread = pooled.run()
+        self.assertEqual(inline["matchups"], spread["matchups"])
+
+    def test_round_robin_standings(self):
+        played = []
+        tournament = Tournament(["random", "hunt", "heatmap"], PRESETS, games=4, seed=1, workers=1, batch=3)
+        results = tournament.run(progress=lambda done, total: played.append((done, total)))
+        self.assertEqual(len(results["matchups"]), 3)
+        self.assertEqual(played[-1], (12, 12))
+        standings = results["standings"][6]
+        self.assertEqual(set(standings), {"random", "hunt", "heatmap"})
+        self.assertEqual(sum(row["wins"] for row in standings.values()), 12)
+        self.assertTrue(all(row["games"] == 8 for row in standings.values()))
+
+    def test_pairings(self):
+        self.assertEqual(pairings(["a", "b", "c"]), [("a", "b"), ("a", "c"), ("b", "c")])
+        self.assertEqual(pairings(["a", "b"], "head-to-head"), [("a", "b")])
+        with self.assertRaises(ValueError):
+            pairings(["a", "b", "c"], "head-to-head")
+        with self.assertRaises(ValueError):
+            Tournament(["hunt", "nope"], PRESETS)
+
+    def test_intervals(self):
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual((low + high) / 2, 0.5)
+        self.assertLess(low, 0.5)
+        self.assertGreater(high, 0.5)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+        self.assertGreaterEqual(wilson_interval(0, 10)[0], 0.0)
+        mean, low, high = mean_interval(30, 302, 3)  # 9, 10, 11
+        self.assertEqual(mean, 10)
+        self.assertLess(low, 10)
+        self.assertGreater(high, 10)
+        self.assertIsNone(mean_interval(0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()